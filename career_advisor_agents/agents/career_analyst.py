@@ -264,7 +264,7 @@ Always maintain a supportive, professional tone while being thorough in your ana
             return ai_response
                 
         except Exception as e:
-            self.logger.error(f"Error in career analysis: {str(e)}")
+            self.logger.error("Error in career analysis: %s", e)
             return AgentResponse(
                 content="I encountered an issue while analyzing your career profile. Let me try a different approach.",
                 confidence=0.3
@@ -319,8 +319,8 @@ NOTE: {'Personalized insights available but limited' if user_profile.get('questi
             
             # Add conversation history
             conversation_context = ""
-            if self.memory.chat_memory.messages:
-                recent_messages = self.memory.chat_memory.messages[-4:]
+            if self._messages:
+                recent_messages = self.get_recent_messages(4)
                 conversation_context = "\n".join([
                     f"{'User' if isinstance(msg, HumanMessage) else 'Assistant'}: {msg.content}"
                     for msg in recent_messages
@@ -339,7 +339,7 @@ Current user message: {message}
 Please provide a comprehensive, personalized response based on your career expertise and the user's context. If they're asking about career recommendations, personality insights, or professional development, draw upon career development theories, industry knowledge, and best practices. Be specific, actionable, and supportive."""
 
             # Call Google Gemini AI
-            self.logger.info(f"Calling Google Gemini for career guidance...")
+            self.logger.info("Calling Google Gemini for career guidance...")
             llm_response = await self.llm.ainvoke([{"role": "user", "content": full_prompt}])
             
             # Extract and process the AI response
@@ -351,7 +351,7 @@ Please provide a comprehensive, personalized response based on your career exper
             # Extract any structured insights from the response
             metadata = self._extract_response_metadata(ai_content, context)
             
-            self.logger.info(f"Generated AI response with {len(ai_content)} characters, confidence: {confidence}")
+            self.logger.info("Generated AI response with %s characters, confidence: %s", len(ai_content), confidence)
             
             return AgentResponse(
                 content=ai_content,
@@ -361,7 +361,7 @@ Please provide a comprehensive, personalized response based on your career exper
             )
             
         except Exception as e:
-            self.logger.error(f"Error in AI-powered response: {str(e)}")
+            self.logger.error("Error in AI-powered response: %s", e)
             # Fallback to general guidance if AI fails
             return await self._general_career_guidance(message, context)
     
@@ -569,8 +569,8 @@ Your answers will help me understand what motivates and energizes you profession
         system_prompt = self.get_system_prompt()
         
         conversation_context = ""
-        if self.memory.chat_memory.messages:
-            recent_messages = self.memory.chat_memory.messages[-4:]
+        if self._messages:
+            recent_messages = self.get_recent_messages(4)
             conversation_context = "\n".join([
                 f"{'User' if hasattr(msg, 'content') and not hasattr(msg, 'response_metadata') else 'Assistant'}: {msg.content}"
                 for msg in recent_messages
@@ -594,7 +594,7 @@ Provide helpful, specific career guidance based on your expertise."""
             )
             
         except Exception as e:
-            self.logger.error(f"Error in general guidance: {str(e)}")
+            self.logger.error("Error in general guidance: %s", e)
             return AgentResponse(
                 content="I'm here to help with career guidance. You can ask me about career assessments, exploring different professions, or getting personalized recommendations. What would you like to know?",
                 confidence=0.6
@@ -303,7 +303,7 @@ Always maintain an encouraging, supportive tone while providing structured, acti
                 return await self._general_learning_guidance(message, context)
                 
         except Exception as e:
-            self.logger.error(f"Error in learning orchestration: {str(e)}")
+            self.logger.error("Error in learning orchestration: %s", e)
             return AgentResponse(
                 content="I encountered an issue while planning your learning path. Let me help you get back on track.",
                 confidence=0.3
@@ -610,7 +610,7 @@ Provide helpful guidance about learning strategies, resource selection, or study
             )
             
         except Exception as e:
-            self.logger.error(f"Error in general guidance: {str(e)}")
+            self.logger.error("Error in general guidance: %s", e)
             return AgentResponse(
                 content="I'm here to help orchestrate your learning journey. You can ask me to create learning paths, find resources, optimize schedules, or provide support when you're facing challenges. What would you like to work on?",
                 confidence=0.6
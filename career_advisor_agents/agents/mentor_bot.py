@@ -484,7 +484,7 @@ You have experience across various industries and career stages, allowing you to
                 return await self._general_mentorship_conversation(message, context)
                 
         except Exception as e:
-            self.logger.error(f"Error in mentorship response: {str(e)}")
+            self.logger.error("Error in mentorship response: %s", e)
             return AgentResponse(
                 content="I'm here to support you through whatever you're facing. Sometimes the most important thing is just knowing someone believes in you and your ability to overcome challenges. What's on your mind today?",
                 confidence=0.7
@@ -780,7 +780,7 @@ Respond as a supportive, experienced mentor who provides both emotional support
             )
             
         except Exception as e:
-            self.logger.error(f"Error in general mentorship: {str(e)}")
+            self.logger.error("Error in general mentorship: %s", e)
             return AgentResponse(
                 content="""I'm here as your mentor and supporter, ready to help you navigate whatever career challenges or opportunities you're facing.
 
@@ -427,7 +427,7 @@ Always provide actionable advice and help users present themselves in the best p
                 return await self._general_opportunity_guidance(message, context)
                 
         except Exception as e:
-            self.logger.error(f"Error in opportunity scouting: {str(e)}")
+            self.logger.error("Error in opportunity scouting: %s", e)
             return AgentResponse(
                 content="I encountered an issue while searching for opportunities. Let me help you explore your options in a different way.",
                 confidence=0.3
@@ -757,7 +757,7 @@ Provide helpful guidance about finding opportunities, job searching, or career e
             )
             
         except Exception as e:
-            self.logger.error(f"Error in general guidance: {str(e)}")
+            self.logger.error("Error in general guidance: %s", e)
             return AgentResponse(
                 content="I'm here to help you discover and pursue career opportunities. You can ask me to find specific types of positions, track your applications, provide guidance on resumes and interviews, or suggest networking strategies. What would you like to explore?",
                 confidence=0.6
@@ -266,7 +266,7 @@ Always maintain a balance between honest assessment and motivational support."""
                 return await self._general_progress_guidance(message, context)
                 
         except Exception as e:
-            self.logger.error(f"Error in progress monitoring: {str(e)}")
+            self.logger.error("Error in progress monitoring: %s", e)
             return AgentResponse(
                 content="I encountered an issue while analyzing your progress. Let me help you get back on track with your learning journey.",
                 confidence=0.3
@@ -612,7 +612,7 @@ Provide supportive guidance about progress monitoring, goal tracking, or maintai
             )
             
         except Exception as e:
-            self.logger.error(f"Error in general guidance: {str(e)}")
+            self.logger.error("Error in general guidance: %s", e)
             return AgentResponse(
                 content="I'm here to help you monitor your progress and stay motivated in your learning journey. You can ask me to analyze your progress, review your goals, provide motivation support, or celebrate your achievements. What would you like to focus on today?",
                 confidence=0.6
@@ -1,6 +1,7 @@
 from typing import Dict, List, Any, Optional
 import json
 from datetime import datetime
+from functools import lru_cache
 from langchain.tools import BaseTool
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -12,6 +13,21 @@ sys.path.insert(0, str(project_root))
 from core.agent_framework import BaseAgent, AgentResponse
 from core.data_models import SkillAssessmentResult, SkillLevel, Skill
 
+# Per-level feedback templates; only the selected one is formatted with the skill name
+_FEEDBACK_TEMPLATES = {
+    "expert": "Excellent mastery of {}! You demonstrate expert-level understanding and can mentor others.",
+    "advanced": "Strong proficiency in {}. You're ready for complex projects and leadership roles.",
+    "intermediate": "Good foundation in {}. Focus on advanced concepts and real-world application.",
+    "beginner": "You're building your {} skills. Focus on fundamentals and hands-on practice."
+}
+_DEFAULT_FEEDBACK_TEMPLATE = "You're developing your {} capabilities."
+
+
+@lru_cache(maxsize=256)
+def _normalize_role(role: str) -> str:
+    """Map a free-text role title to its interned role_requirements key"""
+    return sys.intern(role.lower().replace(" ", "_"))
+
 
 class SkillBenchmarkTool(BaseTool):
     name: str = "skill_benchmark"
@@ -136,7 +152,7 @@ class SkillGapAnalysisTool(BaseTool):
             }
         }
         
-        role_req = role_requirements.get(target_role.lower().replace(" ", "_"), {
+        role_req = role_requirements.get(_normalize_role(target_role), {
             "required": [],
             "preferred": []
         })
@@ -332,7 +348,7 @@ Always maintain an encouraging tone while providing honest, actionable feedback.
                 return await self._general_skill_guidance(message, context)
                 
         except Exception as e:
-            self.logger.error(f"Error in skills assessment: {str(e)}")
+            self.logger.error("Error in skills assessment: %s", e)
             return AgentResponse(
                 content="I encountered an issue while assessing your skills. Let me try a different approach.",
                 confidence=0.3
@@ -560,7 +576,7 @@ Provide helpful guidance about skill assessment, development, or career-relevant
             )
             
         except Exception as e:
-            self.logger.error(f"Error in general guidance: {str(e)}")
+            self.logger.error("Error in general guidance: %s", e)
             return AgentResponse(
                 content="I'm here to help with skill assessment and development. You can ask me to evaluate specific skills, analyze gaps for target roles, or create development plans. What would you like to explore?",
                 confidence=0.6
@@ -572,14 +588,7 @@ Provide helpful guidance about skill assessment, development, or career-relevant
         return "\n".join([f"- {concept.title()}" for concept in concepts])
     
     def _generate_skill_feedback(self, level: str, skill_name: str, assessment: Dict[str, Any]) -> str:
-        feedback = {
-            "expert": f"Excellent mastery of {skill_name}! You demonstrate expert-level understanding and can mentor others.",
-            "advanced": f"Strong proficiency in {skill_name}. You're ready for complex projects and leadership roles.",
-            "intermediate": f"Good foundation in {skill_name}. Focus on advanced concepts and real-world application.",
-            "beginner": f"You're building your {skill_name} skills. Focus on fundamentals and hands-on practice."
-        }
-        
-        base_feedback = feedback.get(level, f"You're developing your {skill_name} capabilities.")
+        base_feedback = _FEEDBACK_TEMPLATES.get(level, _DEFAULT_FEEDBACK_TEMPLATE).format(skill_name)
         
         if assessment["confidence"] < 0.7:
             base_feedback += " Consider additional practice to strengthen your confidence."
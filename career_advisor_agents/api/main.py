@@ -7,21 +7,29 @@ from dotenv import load_dotenv
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-# Load environment variables from .env file
-# Try loading from current directory and parent directory
-load_dotenv()  # Try current directory first
-load_dotenv(project_root / ".env")  # Try project root directory
+# Load environment variables from the first .env found (current directory, then project root)
+for env_path in (Path.cwd() / ".env", project_root / ".env"):
+    if env_path.is_file():
+        load_dotenv(env_path, override=False)
+        break
 
-from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from contextlib import asynccontextmanager
-from typing import Dict, List, Optional, Any
+from sqlalchemy import text
+from typing import Dict, List, Optional, Any, Set
+from logging.handlers import QueueHandler, QueueListener
 import logging
 import asyncio
-from datetime import datetime
+import queue
+import time
+import orjson
+from datetime import datetime, timedelta
 import uuid
 
 from core.llm_config import create_default_llm_config, AgentLLMFactory
+from core.clock import now_iso
 from core.agent_framework import AgentOrchestrator, AgentMetrics
 from agents.career_analyst import CareerAnalystAgent
 from agents.skills_assessor import SkillsAssessorAgent
@@ -29,17 +37,24 @@ from agents.learning_orchestrator import LearningOrchestrationAgent
 from agents.progress_monitor import ProgressMonitorAgent
 from agents.opportunity_scout import OpportunityScoutAgent
 from agents.mentor_bot import MentorBotAgent
-from services.database import get_database, get_user_repository, DatabaseManager, UserRepository
+from services.database import (
+    get_database, get_user_repository, make_json_serializable, DatabaseManager, UserRepository
+)
 from services.career_counseling import CareerCounselingService
 from services.predictive_analytics import PredictiveAnalyticsService
-from services.onboarding_questionnaire import OnboardingQuestionnaireService, QuestionnaireResponse
+from services.onboarding_questionnaire import (
+    OnboardingQuestionnaireService, QuestionnaireSubmission
+)
 from core.data_models import (
     UserProfile, CareerAnalysisRequest, CareerAnalysisResponse,
-    ConversationMessage, ProgressUpdate
+    ConversationMessage, ProgressUpdate, EducationLevel, CareerStage,
+    RegisterUserRequest, ProfileUpdateRequest, CounselingMessage,
+    shared_now
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
+
 logger = logging.getLogger(__name__)
 
 # Global instances
@@ -49,17 +64,60 @@ counseling_service: Optional[CareerCounselingService] = None
 analytics_service: Optional[PredictiveAnalyticsService] = None
 questionnaire_service: Optional[OnboardingQuestionnaireService] = None
 
+# Fields a profile update may set, resolved once instead of hasattr() per key
+_USER_PROFILE_FIELDS = frozenset(UserProfile.model_fields)
+
+# Static fallback for /api/analytics/career-trends when industry and role are not both given
+_CAREER_TRENDS_DEFAULT = {
+    "message": "Please specify both industry and role for detailed analysis",
+    "available_industries": ["technology", "healthcare", "finance", "education", "manufacturing"],
+    "sample_roles": ["software engineer", "data scientist", "marketing manager", "teacher", "nurse"]
+}
+_CAREER_TRENDS_DEFAULT_BYTES = orjson.dumps(_CAREER_TRENDS_DEFAULT)
+
+# Conversations older than this many days are moved to the archive table (0 keeps everything
+# in the hot table); the sweep runs once per interval
+CONVERSATION_ARCHIVE_DAYS = int(os.getenv("CONVERSATION_ARCHIVE_DAYS", "0"))
+CONVERSATION_ARCHIVE_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Warmup prompts are real, billed Gemini calls, so priming the LLM clients is opt-in
+WARMUP_LLM = os.getenv("WARMUP") == "1"
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-flight
+_pending_tasks: Set["asyncio.Task[Any]"] = set()
+
+
+def _start_log_listener() -> Optional[QueueListener]:
+    """Hand root log records to a background thread so stream I/O never blocks the event loop;
+    returns None if the root logger already writes through a queue"""
+    root_logger = logging.getLogger()
+    if any(isinstance(handler, QueueHandler) for handler in root_logger.handlers):
+        return None
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *root_logger.handlers, respect_handler_level=True)
+    root_logger.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
+
+def _stop_log_listener(listener: Optional[QueueListener]):
+    """Flush queued records and give the root logger its handlers back"""
+    if listener is None:
+        return
+    logging.getLogger().handlers = list(listener.handlers)
+    listener.stop()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events for the FastAPI app"""
     # Startup
+    log_listener = _start_log_listener()
     logger.info("Starting Career Advisor Agent System...")
     
     try:
-        # Initialize database
-        db_manager = await get_database()
-        logger.info("Database initialized")
+        # Kick off database initialization so it overlaps with agent setup
+        db_task = asyncio.create_task(get_database())
         
         # Initialize LLM configuration
         llm_config = create_default_llm_config()
@@ -71,58 +129,111 @@ async def lifespan(app: FastAPI):
         agent_orchestrator = AgentOrchestrator()
         agent_metrics = AgentMetrics()
         
-        # Create and register all agents
-        career_analyst_llm = llm_factory.get_llm_for_agent("career_analyst")
-        career_analyst = CareerAnalystAgent(career_analyst_llm)
-        agent_orchestrator.register_agent(career_analyst)
+        def build_with_llm(component_cls, llm_type: str):
+            return component_cls(llm_factory.get_llm_for_agent(llm_type))
+        
+        # LLM client construction is synchronous, so build agents and services
+        # concurrently in worker threads instead of one after another
+        agent_specs = [
+            (CareerAnalystAgent, "career_analyst"),
+            (SkillsAssessorAgent, "skills_assessor"),
+            (LearningOrchestrationAgent, "learning_orchestrator"),
+            (ProgressMonitorAgent, "progress_monitor"),
+            (OpportunityScoutAgent, "opportunity_scout"),
+            (MentorBotAgent, "mentor_bot"),
+        ]
+        service_specs = [
+            (CareerCounselingService, "mentor_bot"),
+            (PredictiveAnalyticsService, "analytics_agent"),
+            (OnboardingQuestionnaireService, "questionnaire_agent"),
+        ]
         
-        skills_assessor_llm = llm_factory.get_llm_for_agent("skills_assessor")
-        skills_assessor = SkillsAssessorAgent(skills_assessor_llm)
-        agent_orchestrator.register_agent(skills_assessor)
+        db_manager, *components = await asyncio.gather(
+            db_task,
+            *(asyncio.to_thread(build_with_llm, cls, llm_type) for cls, llm_type in agent_specs + service_specs)
+        )
+        logger.info("Database initialized")
         
-        learning_orchestrator_llm = llm_factory.get_llm_for_agent("learning_orchestrator")
-        learning_orchestrator = LearningOrchestrationAgent(learning_orchestrator_llm)
-        agent_orchestrator.register_agent(learning_orchestrator)
+        agents = components[:len(agent_specs)]
+        counseling_service, analytics_service, questionnaire_service = components[len(agent_specs):]
         
-        progress_monitor_llm = llm_factory.get_llm_for_agent("progress_monitor")
-        progress_monitor = ProgressMonitorAgent(progress_monitor_llm)
-        agent_orchestrator.register_agent(progress_monitor)
+        # Register all agents
+        for agent in agents:
+            agent_orchestrator.register_agent(agent)
         
-        opportunity_scout_llm = llm_factory.get_llm_for_agent("opportunity_scout")
-        opportunity_scout = OpportunityScoutAgent(opportunity_scout_llm)
-        agent_orchestrator.register_agent(opportunity_scout)
+        logger.info("All services initialized successfully")
         
-        mentor_bot_llm = llm_factory.get_llm_for_agent("mentor_bot")
-        mentor_bot = MentorBotAgent(mentor_bot_llm)
-        agent_orchestrator.register_agent(mentor_bot)
+        # Conversations are persisted in batches by a single background writer
+        app.state.conversation_queue = asyncio.Queue(maxsize=10_000)
+        writer_task = asyncio.create_task(
+            conversation_writer(app.state.conversation_queue, UserRepository(db_manager))
+        )
         
-        # Initialize services
-        counseling_llm = llm_factory.get_llm_for_agent("mentor_bot")
-        counseling_service = CareerCounselingService(counseling_llm)
-        analytics_llm = llm_factory.get_llm_for_agent("analytics_agent")
-        analytics_service = PredictiveAnalyticsService(analytics_llm)
-        questionnaire_llm = llm_factory.get_llm_for_agent("questionnaire_agent")
-        questionnaire_service = OnboardingQuestionnaireService(questionnaire_llm)
+        # Keep the hot conversations table (and its indexes) limited to recent history
+        archiver_task = None
+        if CONVERSATION_ARCHIVE_DAYS > 0:
+            archiver_task = asyncio.create_task(
+                conversation_archiver(UserRepository(db_manager), CONVERSATION_ARCHIVE_DAYS)
+            )
         
-        logger.info("All services initialized successfully")
+        # Prime LLM clients and the DB pool off the request path
+        app.state.warm = False
+        warmup_task = asyncio.create_task(_warmup(app, db_manager))
         
         yield
         
     except Exception as e:
-        logger.error(f"Failed to initialize application: {str(e)}")
+        logger.exception("Failed to initialize application: %s", e)
+        _stop_log_listener(log_listener)
         raise
     
     # Shutdown
     logger.info("Shutting down Career Advisor Agent System...")
+    warmup_task.cancel()
+    try:
+        await asyncio.wait_for(app.state.conversation_queue.join(), timeout=5.0)
+    except asyncio.TimeoutError:
+        logger.warning("Timed out flushing queued conversations")
+    writer_task.cancel()
+    if archiver_task:
+        archiver_task.cancel()
     if db_manager:
         await db_manager.close()
+    _stop_log_listener(log_listener)
+
+
+async def _warmup(app: FastAPI, db_manager: DatabaseManager):
+    """Open a DB connection (and, with WARMUP=1, send one throwaway prompt per LLM client)
+    so the first real request doesn't pay connection setup costs"""
+    try:
+        async with db_manager.get_session() as session:
+            await asyncio.wait_for(session.execute(text("SELECT 1")), timeout=2.0)
+    except Exception as e:
+        logger.debug("Database warmup failed: %s", e)
+    
+    if WARMUP_LLM:
+        llms = {id(agent.llm): agent.llm for agent in agent_orchestrator.agents.values()}
+        for service in (counseling_service, analytics_service, questionnaire_service):
+            llms.setdefault(id(service.llm), service.llm)
+        
+        results = await asyncio.gather(
+            *(asyncio.wait_for(llm.ainvoke("ping"), timeout=2.0) for llm in llms.values()),
+            return_exceptions=True
+        )
+        failures = sum(1 for result in results if isinstance(result, BaseException))
+        if failures:
+            logger.debug("LLM warmup: %s/%s clients did not respond", failures, len(results))
+    
+    app.state.warm = True
+    logger.info("Warmup complete")
 
 
 app = FastAPI(
     title="AI Career & Skill Development Advisor",
     description="Multi-agent system for career planning and skill development using LangChain and Google Gemini",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -140,7 +251,8 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "ready": getattr(app.state, "warm", False),
+        "timestamp": now_iso(),
         "services": {
             "database": "connected" if agent_orchestrator else "disconnected",
             "agents": len(agent_orchestrator.list_agents()) if agent_orchestrator else 0,
@@ -151,40 +263,24 @@ async def health_check():
 # User Management Endpoints
 @app.post("/api/users/register")
 async def register_user(
-    user_data: Dict[str, Any],
+    payload: RegisterUserRequest,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Register a new user"""
     try:
         # Generate user ID if not provided
-        user_id = user_data.get("user_id", str(uuid.uuid4()))
-        
-        # Handle enum conversions for registration
-        from core.data_models import EducationLevel, CareerStage
+        user_id = payload.user_id or str(uuid.uuid4())
         
-        education_level = None
-        if user_data.get("education_level"):
-            try:
-                education_level = EducationLevel(user_data["education_level"])
-            except ValueError:
-                logger.warning(f"Invalid education_level: {user_data.get('education_level')}")
-        
-        career_stage = None
-        if user_data.get("career_stage"):
-            try:
-                career_stage = CareerStage(user_data["career_stage"])
-            except ValueError:
-                logger.warning(f"Invalid career_stage: {user_data.get('career_stage')}")
-        
-        user_profile = UserProfile(
-            user_id=user_id,
-            name=user_data["name"],
-            email=user_data["email"],
-            age=user_data.get("age"),
-            location=user_data.get("location"),
-            education_level=education_level,
-            career_stage=career_stage
-        )
+        with shared_now():
+            user_profile = UserProfile(
+                user_id=user_id,
+                name=payload.name,
+                email=payload.email,
+                age=payload.age,
+                location=payload.location,
+                education_level=payload.education_level,
+                career_stage=payload.career_stage
+            )
         
         await user_repo.create_user(user_profile)
         
@@ -195,10 +291,7 @@ async def register_user(
         }
         
     except Exception as e:
-        logger.error(f"Error registering user: {str(e)}")
-        logger.error(f"User data received: {user_data}")
-        import traceback
-        logger.error(f"Full traceback: {traceback.format_exc()}")
+        logger.exception("Error registering user: %s", e, extra={"user_data": payload.model_dump()})
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
 
@@ -209,31 +302,32 @@ async def get_user_profile(
 ):
     """Get user profile, create if doesn't exist"""
     try:
-        user_profile = await user_repo.get_user(user_id)
-        if not user_profile:
+        cached_profile = await user_repo.get_user_cached(user_id)
+        if not cached_profile:
             # Auto-create user with default profile
-            from core.data_models import UserProfile, EducationLevel, CareerStage
-            default_profile = UserProfile(
-                user_id=user_id,
-                name=f"User {user_id}",
-                email=f"{user_id}@example.com",
-                age=25,
-                location="Not specified",
-                education_level=EducationLevel.BACHELORS,
-                career_stage=CareerStage.ENTRY_LEVEL
-            )
+            with shared_now():
+                default_profile = UserProfile(
+                    user_id=user_id,
+                    name=f"User {user_id}",
+                    email=f"{user_id}@example.com",
+                    age=25,
+                    location="Not specified",
+                    education_level=EducationLevel.BACHELORS,
+                    career_stage=CareerStage.ENTRY_LEVEL
+                )
             success = await user_repo.create_user(default_profile)
             if success:
-                user_profile = await user_repo.get_user(user_id)
+                cached_profile = await user_repo.get_user_cached(user_id)
             else:
                 raise HTTPException(status_code=500, detail="Failed to create user profile")
         
-        return user_profile.dict()
+        # Shared cached dict: only handed to the response encoder, never mutated
+        return cached_profile.serialized
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving user profile: {str(e)}")
+        logger.exception("Error retrieving user profile: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -262,14 +356,14 @@ async def reset_user_data(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error resetting user data: {str(e)}")
+        logger.exception("Error resetting user data: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.put("/api/users/{user_id}/profile")
 async def update_user_profile(
     user_id: str,
-    profile_data: Dict[str, Any],
+    payload: ProfileUpdateRequest,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Update user profile"""
@@ -279,26 +373,18 @@ async def update_user_profile(
         if not existing_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Update with new data, handling enum conversions
-        from core.data_models import EducationLevel, CareerStage
-        
-        for key, value in profile_data.items():
-            if hasattr(existing_profile, key) and value is not None:
-                # Handle enum conversions
-                if key == "education_level" and isinstance(value, str):
-                    try:
-                        value = EducationLevel(value)
-                    except ValueError:
-                        logger.warning(f"Invalid education_level value: {value}")
-                        continue
-                elif key == "career_stage" and isinstance(value, str):
-                    try:
-                        value = CareerStage(value)
-                    except ValueError:
-                        logger.warning(f"Invalid career_stage value: {value}")
-                        continue
-                
-                setattr(existing_profile, key, value)
+        # Collect the fields the client sent that differ from what is stored (enums already validated)
+        changes = {
+            key: value
+            for key, value in payload.model_dump(exclude_unset=True).items()
+            if key in _USER_PROFILE_FIELDS and value is not None
+            and getattr(existing_profile, key) != value
+        }
+        if not changes:
+            return {"message": "No changes", "status": "success"}
+        
+        # Profiles are shared through the cache, so edit a private copy
+        existing_profile = existing_profile.model_copy(update=changes)
         
         success = await user_repo.update_user(existing_profile)
         
@@ -310,7 +396,7 @@ async def update_user_profile(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating user profile: {str(e)}")
+        logger.exception("Error updating user profile: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -343,7 +429,7 @@ async def generate_questionnaire(
         
         return {
             "user_id": user_id,
-            "questions": [q.dict() for q in questions],
+            "questions": [q.model_dump(mode="json") for q in questions],
             "total_questions": len(questions),
             "estimated_time": len(questions) * 2  # 2 minutes per question
         }
@@ -351,14 +437,14 @@ async def generate_questionnaire(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error generating questionnaire: {str(e)}")
+        logger.exception("Error generating questionnaire: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/questionnaire/submit/{user_id}")
 async def submit_questionnaire(
     user_id: str,
-    submission_data: Dict[str, Any],
+    submission: QuestionnaireSubmission,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Submit completed questionnaire responses"""
@@ -371,12 +457,8 @@ async def submit_questionnaire(
         if not user_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Parse responses
-        questions_data = submission_data.get("questions", [])
-        responses_data = submission_data.get("responses", [])
-        
-        questions = [questionnaire_service._get_fallback_questions()[0].__class__(**q) for q in questions_data]
-        responses = [QuestionnaireResponse(**r) for r in responses_data]
+        questions = submission.questions
+        responses = submission.responses
         
         # Analyze responses
         analysis = await questionnaire_service.analyze_questionnaire_responses(
@@ -385,14 +467,13 @@ async def submit_questionnaire(
         
         # Save to database with proper JSON serialization
         questionnaire_data = {
-            "responses": [r.dict() for r in responses],
+            "responses": [r.model_dump() for r in responses],
             "analysis": analysis,
             "completed_at": datetime.now().isoformat()
         }
         
         # Ensure all data is JSON serializable
-        import json
-        questionnaire_data = json.loads(json.dumps(questionnaire_data, default=str))
+        questionnaire_data = make_json_serializable(questionnaire_data)
         
         await user_repo.save_questionnaire_results(user_id, questionnaire_data)
         
@@ -409,7 +490,7 @@ async def submit_questionnaire(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error submitting questionnaire: {str(e)}")
+        logger.exception("Error submitting questionnaire: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -438,7 +519,7 @@ async def get_questionnaire_status(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting questionnaire status: {str(e)}")
+        logger.exception("Error getting questionnaire status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -446,7 +527,6 @@ async def get_questionnaire_status(
 @app.post("/api/agents/career-analysis")
 async def career_analysis(
     request: CareerAnalysisRequest,
-    background_tasks: BackgroundTasks,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Perform career analysis using career analyst agent"""
@@ -454,16 +534,16 @@ async def career_analysis(
         if not agent_orchestrator:
             raise HTTPException(status_code=503, detail="Agent system not initialized")
         
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         
         # Get user profile
-        user_profile = await user_repo.get_user(request.user_id)
-        if not user_profile:
+        cached_profile = await user_repo.get_user_cached(request.user_id)
+        if not cached_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Prepare context for agent
         context = {
-            "user_profile": user_profile.dict(),
+            "user_profile": cached_profile.profile.model_dump(),
             "analysis_type": request.analysis_type,
             "parameters": request.parameters
         }
@@ -481,53 +561,59 @@ async def career_analysis(
         
         target_agent = agent_routing.get(request.analysis_type, "career_analyst")
         
-        response = await agent_orchestrator.route_message(
-            message=f"Perform {request.analysis_type} analysis",
-            agent_name=target_agent,
-            context=context
-        )
-        
-        processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
-        
-        # Record metrics
-        if agent_metrics:
-            agent_metrics.record_interaction(target_agent, processing_time / 1000, response.confidence)
-        
-        # Note: Analysis requests are not saved as conversations to keep them separate from chat
-        
-        return CareerAnalysisResponse(
-            request_id=str(uuid.uuid4()),
-            user_id=request.user_id,
-            analysis_type=request.analysis_type,
-            results=response.metadata,
-            confidence=response.confidence * 100,
-            processing_time_ms=processing_time
-        ).dict()
+        # The agent's assessments and the response share one timestamp
+        with shared_now():
+            response = await agent_orchestrator.route_message(
+                message=f"Perform {request.analysis_type} analysis",
+                agent_name=target_agent,
+                context=context
+            )
+            
+            processing_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+            
+            # Record metrics
+            if agent_metrics:
+                agent_metrics.record_interaction(target_agent, processing_time / 1000, response.confidence)
+            
+            # Note: Analysis requests are not saved as conversations to keep them separate from chat
+            
+            # Built from the validated request and agent output, so skip validation
+            return CareerAnalysisResponse.model_construct(
+                request_id=str(uuid.uuid4()),
+                user_id=request.user_id,
+                analysis_type=request.analysis_type,
+                results=response.metadata,
+                confidence=response.confidence * 100,
+                processing_time_ms=processing_time
+            ).model_dump(mode="json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in career analysis: {str(e)}")
+        logger.exception("Error in career analysis: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/api/agents/counseling/chat")
 async def counseling_chat(
-    message_data: Dict[str, Any],
-    background_tasks: BackgroundTasks,
+    payload: CounselingMessage,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Chat with career counseling service"""
     try:
-        user_id = message_data["user_id"]
-        message = message_data["message"]
+        user_id = payload.user_id
+        message = payload.message
         
         if not counseling_service:
             raise HTTPException(status_code=503, detail="Counseling service not initialized")
         
-        # Get user profile and conversation history
-        user_profile = await user_repo.get_user(user_id)
-        conversation_history = await user_repo.get_conversation_history(user_id, limit=10)
+        start_ns = time.perf_counter_ns()
+        
+        # Get user profile and conversation history concurrently
+        user_profile, conversation_history = await asyncio.gather(
+            user_repo.get_user(user_id),
+            user_repo.get_conversation_history(user_id, limit=10, include_details=False)
+        )
         
         # Process counseling request
         result = await counseling_service.process_counseling_request(
@@ -537,10 +623,8 @@ async def counseling_chat(
             conversation_history=conversation_history
         )
         
-        # Save conversation in background
-        background_tasks.add_task(
-            save_conversation_background,
-            user_repo,
+        # Hand the conversation to the batched background writer
+        await queue_conversation(
             user_id,
             "mentor_bot",
             message,
@@ -548,7 +632,7 @@ async def counseling_chat(
             {"sentiment": result["sentiment_analysis"]},
             result.get("conversation_metadata", {}),
             result["sentiment_analysis"].get("confidence_level", 0.5),
-            None
+            (time.perf_counter_ns() - start_ns) // 1_000_000
         )
         
         return {
@@ -561,10 +645,74 @@ async def counseling_chat(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in counseling chat: {str(e)}")
+        logger.exception("Error in counseling chat: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/agents/counseling/chat/stream")
+async def counseling_chat_stream(
+    payload: CounselingMessage,
+    user_repo: UserRepository = Depends(get_user_repository)
+):
+    """Chat with career counseling service, streaming the reply as Server-Sent Events"""
+    try:
+        user_id = payload.user_id
+        message = payload.message
+        
+        if not counseling_service:
+            raise HTTPException(status_code=503, detail="Counseling service not initialized")
+        
+        start_ns = time.perf_counter_ns()
+        
+        # Get user profile and conversation history concurrently
+        user_profile, conversation_history = await asyncio.gather(
+            user_repo.get_user(user_id),
+            user_repo.get_conversation_history(user_id, limit=10, include_details=False)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("Error in counseling chat stream: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def event_stream():
+        response_parts = []
+        final_event: Dict[str, Any] = {}
+        events = counseling_service.stream_counseling_request(
+            user_id=user_id,
+            message=message,
+            user_profile=user_profile,
+            conversation_history=conversation_history
+        )
+        
+        try:
+            async for event in events:
+                if "delta" in event:
+                    response_parts.append(event["delta"])
+                else:
+                    final_event = event
+                yield b"data: " + orjson.dumps(event) + b"\n\n"
+        finally:
+            await events.aclose()
+            # Persist the exchange even if the client disconnected partway through
+            if response_parts or final_event:
+                sentiment = final_event.get("sentiment_analysis", {})
+                metadata = final_event.get("conversation_metadata") or {"truncated": True}
+                await queue_conversation(
+                    user_id,
+                    "mentor_bot",
+                    message,
+                    "".join(response_parts).strip(),
+                    {"sentiment": sentiment},
+                    metadata,
+                    sentiment.get("confidence_level", 0.5),
+                    (time.perf_counter_ns() - start_ns) // 1_000_000
+                )
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @app.get("/api/agents/recommendations/{user_id}")
 async def get_career_recommendations(
     user_id: str,
@@ -576,9 +724,10 @@ async def get_career_recommendations(
             raise HTTPException(status_code=503, detail="Agent system not initialized")
         
         # Get user profile
-        user_profile = await user_repo.get_user(user_id)
-        if not user_profile:
+        cached_profile = await user_repo.get_user_cached(user_id)
+        if not cached_profile:
             raise HTTPException(status_code=404, detail="User not found")
+        user_profile = cached_profile.profile
         
         # Check if user has completed questionnaire for personalized recommendations
         questionnaire_completed = user_profile.questionnaire_completed if hasattr(user_profile, 'questionnaire_completed') else False
@@ -600,7 +749,7 @@ async def get_career_recommendations(
         # Get personalized recommendations from career analyst
         message = "Based on my completed questionnaire data, provide detailed career recommendations that are specifically tailored to my personality insights, interests, values, and career goals."
         
-        context = {"user_profile": user_profile.dict()}
+        context = {"user_profile": cached_profile.profile.model_dump()}
         response = await agent_orchestrator.route_message(
             message=message,
             agent_name="career_analyst",
@@ -618,7 +767,7 @@ async def get_career_recommendations(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting recommendations: {str(e)}")
+        logger.exception("Error getting recommendations: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -644,15 +793,11 @@ async def get_career_trends(
             )
             return result
         else:
-            # Return general trends
-            return {
-                "message": "Please specify both industry and role for detailed analysis",
-                "available_industries": ["technology", "healthcare", "finance", "education", "manufacturing"],
-                "sample_roles": ["software engineer", "data scientist", "marketing manager", "teacher", "nurse"]
-            }
+            # Return general trends (static, serialized once at import)
+            return Response(content=_CAREER_TRENDS_DEFAULT_BYTES, media_type="application/json")
             
     except Exception as e:
-        logger.error(f"Error getting career trends: {str(e)}")
+        logger.exception("Error getting career trends: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -680,11 +825,11 @@ async def get_skill_demand_analysis(skills: str):
                 }
                 for pred in predictions
             ],
-            "analysis_date": datetime.now().isoformat()
+            "analysis_date": now_iso()
         }
         
     except Exception as e:
-        logger.error(f"Error analyzing skill demand: {str(e)}")
+        logger.exception("Error analyzing skill demand: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -705,7 +850,7 @@ async def get_market_predictions(
             return {"error": "Only 'disruption' analysis type is currently supported"}
             
     except Exception as e:
-        logger.error(f"Error getting market predictions: {str(e)}")
+        logger.exception("Error getting market predictions: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -732,7 +877,7 @@ async def get_system_metrics():
     return {
         "agent_metrics": agent_metrics.get_all_metrics(),
         "system_status": "operational",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso()
     }
 
 
@@ -740,11 +885,12 @@ async def get_system_metrics():
 async def get_conversation_history(
     user_id: str,
     limit: int = 20,
+    before: Optional[datetime] = None,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
-    """Get conversation history for user (excludes analysis requests)"""
+    """Get conversation history for user (excludes analysis requests); page back with `before`"""
     try:
-        conversations = await user_repo.get_conversation_history(user_id, limit)
+        conversations = await user_repo.get_conversation_history(user_id, limit, before=before)
         
         # Filter out analysis requests to keep them separate from chat
         chat_conversations = [
@@ -754,18 +900,17 @@ async def get_conversation_history(
         
         return {
             "user_id": user_id,
-            "conversations": [conv.dict() for conv in chat_conversations],
+            "conversations": [conv.model_dump(mode="json") for conv in chat_conversations],
             "total_count": len(chat_conversations)
         }
         
     except Exception as e:
-        logger.error(f"Error getting conversation history: {str(e)}")
+        logger.exception("Error getting conversation history: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Background Tasks
-async def save_conversation_background(
-    user_repo: UserRepository,
+async def queue_conversation(
     user_id: str,
     agent_name: str,
     user_message: str,
@@ -775,27 +920,14 @@ async def save_conversation_background(
     confidence: float,
     processing_time_ms: Optional[int]
 ):
-    """Save conversation to database in background"""
+    """Queue conversation for the batched background writer"""
     try:
-        import json
-        
         # Clean up context and metadata to be JSON serializable
-        def make_json_serializable(obj):
-            if isinstance(obj, dict):
-                return {k: make_json_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [make_json_serializable(item) for item in obj]
-            elif isinstance(obj, datetime):
-                return obj.isoformat()
-            elif hasattr(obj, '__dict__'):
-                return str(obj)  # Convert objects to string representation
-            else:
-                return obj
-        
         clean_context = make_json_serializable(context)
         clean_metadata = make_json_serializable(metadata)
         
-        conversation = ConversationMessage(
+        # Every field is produced server-side, so skip validation
+        conversation = ConversationMessage.model_construct(
             message_id=str(uuid.uuid4()),
             user_id=user_id,
             agent_name=agent_name,
@@ -808,16 +940,85 @@ async def save_conversation_background(
             timestamp=datetime.now()
         )
         
-        await user_repo.save_conversation(conversation)
+        conversation_queue = app.state.conversation_queue
+        try:
+            conversation_queue.put_nowait(conversation)
+        except asyncio.QueueFull:
+            # Detach the wait for queue space from the request; keep a reference so it isn't GC'd
+            task = asyncio.create_task(conversation_queue.put(conversation))
+            _pending_tasks.add(task)
+            task.add_done_callback(_pending_tasks.discard)
         
     except Exception as e:
-        logger.error(f"Error saving conversation: {str(e)}")
+        logger.exception("Error queueing conversation: %s", e)
+
+
+async def conversation_archiver(
+    user_repo: UserRepository,
+    retention_days: int,
+    interval: float = CONVERSATION_ARCHIVE_INTERVAL_SECONDS
+):
+    """Periodically move conversations past the retention window into the archive table"""
+    while True:
+        try:
+            moved = await user_repo.archive_conversations(datetime.now() - timedelta(days=retention_days))
+            if moved:
+                logger.info("Archived %s conversations older than %s days", moved, retention_days)
+        except Exception as e:
+            logger.exception("Error archiving conversations: %s", e)
+        
+        await asyncio.sleep(interval)
+
+
+async def conversation_writer(
+    conversation_queue: "asyncio.Queue[ConversationMessage]",
+    user_repo: UserRepository,
+    max_batch_size: int = 50,
+    flush_interval: float = 0.2
+):
+    """Drain queued conversations and persist them in multi-row batches"""
+    while True:
+        batch = [await conversation_queue.get()]
+        while len(batch) < max_batch_size:
+            try:
+                batch.append(conversation_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        
+        try:
+            await user_repo.save_conversations_bulk(batch)
+        except Exception as e:
+            logger.exception("Error saving %s conversations: %s", len(batch), e)
+        finally:
+            for _ in batch:
+                conversation_queue.task_done()
+        
+        # Pause only after a partial batch so more rows can accumulate; a full batch means
+        # there is a backlog, and sleeping would cap throughput at max_batch_size per interval
+        if len(batch) < max_batch_size:
+            await asyncio.sleep(flush_interval)
 
 
 def main():
     """Main entry point for running the application"""
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001, reload=True)
+    
+    # Auto-reload forces a single process, so only enable it with --dev or DEV=1
+    dev_mode = "--dev" in sys.argv[1:] or os.getenv("DEV") == "1"
+    # Caches, agent memory and the conversation writer are per process, so extra workers are opt-in
+    workers = int(os.getenv("WORKERS", "1"))
+    uvicorn.run(
+        "api.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8001")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        reload=dev_mode,
+        workers=None if dev_mode else workers,
+        backlog=int(os.getenv("BACKLOG", "4096")),
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", "1024")),
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_TIMEOUT", "30"))
+    )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
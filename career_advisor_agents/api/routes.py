@@ -1,14 +1,227 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
-from typing import Dict, List, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Response
+from typing import Dict, List, Any, Optional, Tuple
 import logging
-from datetime import datetime
+import asyncio
+import re
 import uuid
+import orjson
 
 from ..services.database import get_user_repository, UserRepository
-from ..core.data_models import UserProfile, SkillAssessmentResult, ProgressUpdate, UserGoal
+from ..core.clock import now_iso
+from ..core.data_models import (
+    UserProfile, SkillAssessmentResult, SkillLevel, ProgressUpdate, UserGoal,
+    GoalCreateRequest, SkillsAssessmentRequest, ProgressUpdateRequest, LearningPathRequest
+)
 
 logger = logging.getLogger(__name__)
 
+
+def _json_escape(value: str) -> bytes:
+    """JSON-escape a string for splicing into a pre-encoded template"""
+    return orjson.dumps(value)[1:-1]
+
+
+# Mock payloads are invariant across requests, so build them once at import.
+# Only per-request values (ids, user ids, timestamps, placeholders) are filled in per call.
+_MOCK_GOALS = (
+    {
+        "title": "Learn Python Programming",
+        "description": "Master Python for data science applications",
+        "category": "skill_development",
+        "status": "active",
+        "progress_percentage": 35.0,
+        "target_date": "2024-06-30",
+        "created_at": "2024-01-15"
+    },
+    {
+        "title": "Transition to Data Science Role",
+        "description": "Secure a data scientist position in tech industry",
+        "category": "career",
+        "status": "active",
+        "progress_percentage": 20.0,
+        "target_date": "2024-12-31",
+        "created_at": "2024-01-10"
+    }
+)
+
+_MOCK_OVERALL_PROGRESS = orjson.Fragment(orjson.dumps({
+    "career_goals_completion": 25.0,
+    "skills_development_progress": 40.0,
+    "learning_activities_completed": 12,
+    "total_activities_planned": 30,
+    "streak_days": 7,
+    "last_activity_date": "2024-01-20"
+}))
+
+_MOCK_ACTIVE_GOALS = (
+    {
+        "title": "Learn Python Programming",
+        "progress_percentage": 35.0,
+        "days_remaining": 160,
+        "status": "on_track"
+    },
+)
+
+_MOCK_RECENT_ACHIEVEMENTS = orjson.Fragment(orjson.dumps([
+    "Completed Python Basics Course",
+    "Built first data analysis project",
+    "Achieved 7-day learning streak"
+]))
+
+_MOCK_UPCOMING_MILESTONES = orjson.Fragment(orjson.dumps([
+    "Complete intermediate Python course",
+    "Start machine learning fundamentals",
+    "Build portfolio project"
+]))
+
+_LEARNING_PATH_TEMPLATE: bytes = orjson.dumps({
+    "skill_name": "__SKILL__",
+    "current_level": "__CURRENT_LEVEL__",
+    "target_level": "__TARGET_LEVEL__",
+    "estimated_duration_weeks": 12,
+    "learning_modules": [
+        {
+            "module_id": 1,
+            "title": "__SKILL__ Fundamentals",
+            "duration_weeks": 3,
+            "resources": [
+                {"type": "course", "name": "Introduction to __SKILL__", "provider": "Online Platform"},
+                {"type": "book", "name": "__SKILL__ for Beginners", "author": "Expert Author"},
+                {"type": "practice", "name": "Hands-on exercises", "description": "Interactive coding exercises"}
+            ]
+        },
+        {
+            "module_id": 2,
+            "title": "Intermediate __SKILL__",
+            "duration_weeks": 4,
+            "resources": [
+                {"type": "course", "name": "Advanced __SKILL__ Concepts", "provider": "Online Platform"},
+                {"type": "project", "name": "Real-world project", "description": "Build practical application"},
+            ]
+        },
+        {
+            "module_id": 3,
+            "title": "Applied __SKILL__",
+            "duration_weeks": 5,
+            "resources": [
+                {"type": "project", "name": "Portfolio project", "description": "Showcase your skills"},
+                {"type": "mentorship", "name": "Expert guidance", "description": "1-on-1 sessions with expert"},
+            ]
+        }
+    ],
+    "milestones": [
+        {"week": 3, "milestone": "Complete __SKILL__ basics"},
+        {"week": 7, "milestone": "Build first intermediate project"},
+        {"week": 12, "milestone": "Complete portfolio project"}
+    ],
+    "success_metrics": [
+        "Demonstrate proficiency in core __SKILL__ concepts",
+        "Complete at least 2 practical projects",
+        "Receive positive feedback on portfolio project"
+    ]
+})
+
+# Filled in one pass so user text that looks like a placeholder is never substituted again
+_LEARNING_PATH_PLACEHOLDER_RE = re.compile(rb"__(SKILL|CURRENT_LEVEL|TARGET_LEVEL)__")
+
+_MOCK_OPPORTUNITIES = (
+    {
+        "title": "Data Science Intern",
+        "company": "TechCorp",
+        "location": "San Francisco, CA",
+        "type": "internship",
+        "description": "Work with our data science team on real-world projects",
+        "requirements": ["Python", "Statistics", "Machine Learning basics"],
+        "match_score": 85.0,
+        "application_deadline": "2024-03-15",
+        "application_url": "https://example.com/apply",
+        "matching_reasons": [
+            "Strong match with Python skills",
+            "Aligns with data science career goal",
+            "Good fit for current education level"
+        ]
+    },
+    {
+        "title": "Junior Software Developer",
+        "company": "StartupXYZ",
+        "location": "Remote",
+        "type": "job",
+        "description": "Entry-level position for new graduates",
+        "requirements": ["Programming fundamentals", "Problem solving", "Team collaboration"],
+        "match_score": 75.0,
+        "application_deadline": "2024-04-01",
+        "application_url": "https://example.com/apply2",
+        "matching_reasons": [
+            "Entry-level position suitable for career stage",
+            "Remote work matches preferences",
+            "Strong technical foundation alignment"
+        ]
+    }
+)
+
+
+def _encode_mock_record(id_field: str, record: Dict[str, Any]) -> orjson.Fragment:
+    """Pre-encode a mock record with a stable id derived from its title; the id is the same
+    for every user and for every endpoint that serves the same title"""
+    record_id = str(uuid.uuid5(uuid.NAMESPACE_URL, f"{id_field}:{record['title']}"))
+    return orjson.Fragment(orjson.dumps({id_field: record_id, **record}))
+
+
+# Filter indexes over the pre-encoded mock records, built once at import
+_ALL_GOALS = tuple(_encode_mock_record("goal_id", goal) for goal in _MOCK_GOALS)
+_GOALS_BY_STATUS: Dict[str, Tuple[orjson.Fragment, ...]] = {}
+for _goal, _encoded in zip(_MOCK_GOALS, _ALL_GOALS):
+    _GOALS_BY_STATUS[_goal["status"]] = _GOALS_BY_STATUS.get(_goal["status"], ()) + (_encoded,)
+# Progress summaries of the same goals, carrying the goal_id served by the goals endpoint
+_ACTIVE_GOALS = tuple(_encode_mock_record("goal_id", goal) for goal in _MOCK_ACTIVE_GOALS)
+
+# (lowercased location, encoded record) pairs, keyed by opportunity type
+_OPPORTUNITIES_BY_TYPE: Dict[str, Tuple[Tuple[str, orjson.Fragment], ...]] = {"all": ()}
+for _opp in _MOCK_OPPORTUNITIES:
+    _entry = (_opp["location"].lower(), _encode_mock_record("opportunity_id", _opp))
+    _OPPORTUNITIES_BY_TYPE["all"] += (_entry,)
+    _OPPORTUNITIES_BY_TYPE[_opp["type"]] = _OPPORTUNITIES_BY_TYPE.get(_opp["type"], ()) + (_entry,)
+del _goal, _encoded, _opp, _entry
+
+_INDUSTRY_INSIGHTS_TEMPLATE: bytes = orjson.dumps({
+    "industry": "__INDUSTRY__",
+    "overview": {
+        "market_size": "$500B globally",
+        "growth_rate": "8.2% annually",
+        "employment": "2.3M professionals",
+        "average_salary": "$75,000 - $150,000"
+    },
+    "trending_skills": [
+        {"skill": "Artificial Intelligence", "demand_growth": 45.2},
+        {"skill": "Cloud Computing", "demand_growth": 35.8},
+        {"skill": "Data Analysis", "demand_growth": 28.7},
+        {"skill": "Cybersecurity", "demand_growth": 31.4}
+    ],
+    "top_companies": [
+        {"name": "Google", "employees": "150k+", "rating": 4.5},
+        {"name": "Microsoft", "employees": "200k+", "rating": 4.4},
+        {"name": "Amazon", "employees": "1.5M+", "rating": 4.2}
+    ],
+    "career_paths": [
+        {
+            "path": "Software Engineer → Senior Engineer → Tech Lead → Engineering Manager",
+            "typical_duration": "8-12 years",
+            "salary_progression": "$80k → $120k → $160k → $200k+"
+        },
+        {
+            "path": "Data Analyst → Data Scientist → Senior Data Scientist → Data Science Manager",
+            "typical_duration": "6-10 years",
+            "salary_progression": "$70k → $110k → $140k → $180k+"
+        }
+    ],
+    "future_outlook": {
+        "automation_impact": "Low to Medium",
+        "growth_projection": "Strong growth expected through 2030",
+        "key_challenges": ["Skills shortage", "Rapid technology change", "Competition for talent"],
+        "opportunities": ["AI/ML integration", "Remote work normalization", "Increased digitization"]
+    }
+})
+
 # Create routers for different API sections
 user_router = APIRouter(prefix="/api/users", tags=["users"])
 agent_router = APIRouter(prefix="/api/agents", tags=["agents"])
@@ -20,7 +233,7 @@ progress_router = APIRouter(prefix="/api/progress", tags=["progress"])
 @user_router.post("/{user_id}/goals")
 async def create_user_goal(
     user_id: str,
-    goal_data: Dict[str, Any],
+    goal_data: GoalCreateRequest,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Create a new goal for the user"""
@@ -30,16 +243,8 @@ async def create_user_goal(
         if not user_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
-        goal = UserGoal(
-            user_id=user_id,
-            title=goal_data["title"],
-            description=goal_data.get("description", ""),
-            category=goal_data["category"],
-            target_date=goal_data.get("target_date"),
-            priority=goal_data.get("priority", 5),
-            milestones=goal_data.get("milestones", []),
-            success_metrics=goal_data.get("success_metrics", [])
-        )
+        # goal_data is already validated, so skip re-validation
+        goal = UserGoal.model_construct(user_id=user_id, **goal_data.model_dump())
         
         # In a full implementation, you'd save this to the database
         # await user_repo.save_user_goal(goal)
@@ -53,7 +258,7 @@ async def create_user_goal(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating user goal: {str(e)}")
+        logger.exception("Error creating user goal: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -63,7 +268,8 @@ async def get_user_goals(
     status: Optional[str] = None,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
-    """Get user's goals, optionally filtered by status"""
+    """Get user's goals, optionally filtered by status. The mock goal_ids are
+    derived from goal titles, so every user sees the same ids"""
     try:
         # Verify user exists
         user_profile = await user_repo.get_user(user_id)
@@ -71,90 +277,78 @@ async def get_user_goals(
             raise HTTPException(status_code=404, detail="User not found")
         
         # Mock data - in full implementation, fetch from database
-        goals = [
-            {
-                "goal_id": str(uuid.uuid4()),
-                "title": "Learn Python Programming",
-                "description": "Master Python for data science applications",
-                "category": "skill_development",
-                "status": "active",
-                "progress_percentage": 35.0,
-                "target_date": "2024-06-30",
-                "created_at": "2024-01-15"
-            },
-            {
-                "goal_id": str(uuid.uuid4()),
-                "title": "Transition to Data Science Role",
-                "description": "Secure a data scientist position in tech industry",
-                "category": "career",
-                "status": "active",
-                "progress_percentage": 20.0,
-                "target_date": "2024-12-31",
-                "created_at": "2024-01-10"
-            }
-        ]
-        
-        # Filter by status if provided
-        if status:
-            goals = [goal for goal in goals if goal["status"] == status]
+        goals = _GOALS_BY_STATUS.get(status, ()) if status else _ALL_GOALS
         
-        return {
-            "user_id": user_id,
-            "goals": goals,
-            "total_count": len(goals)
-        }
+        return Response(
+            content=orjson.dumps({
+                "user_id": user_id,
+                "goals": goals,
+                "total_count": len(goals)
+            }),
+            media_type="application/json"
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving user goals: {str(e)}")
+        logger.exception("Error retrieving user goals: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Skills Assessment Routes
 @agent_router.post("/skills-assessment")
 async def conduct_skills_assessment(
-    assessment_data: Dict[str, Any],
+    assessment_data: SkillsAssessmentRequest,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Conduct skills assessment for a user"""
     try:
-        user_id = assessment_data["user_id"]
-        skills_to_assess = assessment_data.get("skills", [])
+        user_id = assessment_data.user_id
+        skills_to_assess = assessment_data.skills
         
-        # Verify user exists
-        user_profile = await user_repo.get_user(user_id)
-        if not user_profile:
-            raise HTTPException(status_code=404, detail="User not found")
+        # Start the user lookup and yield once so its DB query is in flight
+        # while the (independent) assessment below is computed
+        user_task = asyncio.create_task(user_repo.get_user(user_id))
+        await asyncio.sleep(0)
         
         # Mock skills assessment logic
         assessment_results = []
-        for skill in skills_to_assess:
-            # Simulate assessment based on skill
-            confidence = 75.0 if skill.lower() in ["python", "communication"] else 65.0
-            level = "intermediate" if confidence > 70 else "beginner"
-            
-            result = SkillAssessmentResult(
-                user_id=user_id,
-                skill_name=skill,
-                assessed_level=level,
-                confidence_score=confidence,
-                strengths=["Quick learner", "Problem solver"],
-                improvement_areas=["Advanced techniques", "Best practices"],
-                recommendations=[
-                    f"Practice {skill} through hands-on projects",
-                    f"Take advanced {skill} course",
-                    f"Join {skill} community forums"
-                ],
-                assessment_method="interactive_questionnaire"
-            )
-            
-            assessment_results.append(result.dict())
+        try:
+            for skill in skills_to_assess:
+                # Simulate assessment based on skill
+                confidence = 75.0 if skill.lower() in ["python", "communication"] else 65.0
+                level = SkillLevel.INTERMEDIATE if confidence > 70 else SkillLevel.BEGINNER
+                
+                # All values are produced here, so skip validation
+                result = SkillAssessmentResult.model_construct(
+                    user_id=user_id,
+                    skill_name=skill,
+                    assessed_level=level,
+                    confidence_score=confidence,
+                    strengths=["Quick learner", "Problem solver"],
+                    improvement_areas=["Advanced techniques", "Best practices"],
+                    recommendations=[
+                        f"Practice {skill} through hands-on projects",
+                        f"Take advanced {skill} course",
+                        f"Join {skill} community forums"
+                    ],
+                    assessment_method="interactive_questionnaire"
+                )
+                
+                assessment_results.append(result.model_dump(mode="json"))
+        except Exception:
+            user_task.cancel()
+            raise
+        
+        # Verify user exists
+        user_profile = await user_task
+        if not user_profile:
+            raise HTTPException(status_code=404, detail="User not found")
         
         return {
             "user_id": user_id,
             "assessment_results": assessment_results,
-            "assessment_date": datetime.now().isoformat(),
+            "assessment_date": now_iso(),
             "next_steps": [
                 "Review assessment results",
                 "Create learning plan for improvement areas",
@@ -165,7 +359,7 @@ async def conduct_skills_assessment(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error conducting skills assessment: {str(e)}")
+        logger.exception("Error conducting skills assessment: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -175,7 +369,8 @@ async def get_user_progress(
     user_id: str,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
-    """Get overall progress for user"""
+    """Get overall progress for user. Active goals reuse the mock goal_ids from
+    the goals endpoint, which are the same for every user"""
     try:
         # Verify user exists
         user_profile = await user_repo.get_user(user_id)
@@ -185,48 +380,25 @@ async def get_user_progress(
         # Mock progress data - in full implementation, calculate from database
         progress_summary = {
             "user_id": user_id,
-            "overall_progress": {
-                "career_goals_completion": 25.0,
-                "skills_development_progress": 40.0,
-                "learning_activities_completed": 12,
-                "total_activities_planned": 30,
-                "streak_days": 7,
-                "last_activity_date": "2024-01-20"
-            },
-            "active_goals": [
-                {
-                    "goal_id": str(uuid.uuid4()),
-                    "title": "Learn Python Programming",
-                    "progress_percentage": 35.0,
-                    "days_remaining": 160,
-                    "status": "on_track"
-                }
-            ],
-            "recent_achievements": [
-                "Completed Python Basics Course",
-                "Built first data analysis project",
-                "Achieved 7-day learning streak"
-            ],
-            "upcoming_milestones": [
-                "Complete intermediate Python course",
-                "Start machine learning fundamentals",
-                "Build portfolio project"
-            ]
+            "overall_progress": _MOCK_OVERALL_PROGRESS,
+            "active_goals": _ACTIVE_GOALS,
+            "recent_achievements": _MOCK_RECENT_ACHIEVEMENTS,
+            "upcoming_milestones": _MOCK_UPCOMING_MILESTONES
         }
         
-        return progress_summary
+        return Response(content=orjson.dumps(progress_summary), media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving user progress: {str(e)}")
+        logger.exception("Error retrieving user progress: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @progress_router.post("/{user_id}/update")
 async def update_progress(
     user_id: str,
-    progress_data: Dict[str, Any],
+    progress_data: ProgressUpdateRequest,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Update progress for a specific goal or skill"""
@@ -236,18 +408,8 @@ async def update_progress(
         if not user_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
-        progress_update = ProgressUpdate(
-            user_id=user_id,
-            skill_name=progress_data.get("skill_name"),
-            goal_name=progress_data.get("goal_name"),
-            progress_percentage=progress_data["progress_percentage"],
-            milestones_completed=progress_data.get("milestones_completed", []),
-            current_activities=progress_data.get("current_activities", []),
-            achievements=progress_data.get("achievements", []),
-            challenges=progress_data.get("challenges", []),
-            next_steps=progress_data.get("next_steps", []),
-            notes=progress_data.get("notes")
-        )
+        # progress_data is already validated, so skip re-validation
+        progress_update = ProgressUpdate.model_construct(user_id=user_id, **progress_data.model_dump())
         
         # In full implementation, save to database
         # await user_repo.save_progress_update(progress_update)
@@ -256,94 +418,59 @@ async def update_progress(
             "message": "Progress updated successfully",
             "update_id": str(uuid.uuid4()),
             "status": "success",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating progress: {str(e)}")
+        logger.exception("Error updating progress: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Learning and Development Routes
 @agent_router.post("/learning-path")
 async def create_learning_path(
-    learning_data: Dict[str, Any],
+    learning_data: LearningPathRequest,
     user_repo: UserRepository = Depends(get_user_repository)
 ):
     """Create a personalized learning path for user"""
     try:
-        user_id = learning_data["user_id"]
-        target_skill = learning_data["target_skill"]
-        current_level = learning_data.get("current_level", "beginner")
-        target_level = learning_data.get("target_level", "intermediate")
+        user_id = learning_data.user_id
+        target_skill = learning_data.target_skill
+        current_level = learning_data.current_level
+        target_level = learning_data.target_level
         
         # Verify user exists
         user_profile = await user_repo.get_user(user_id)
         if not user_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Generate mock learning path
-        learning_path = {
-            "skill_name": target_skill,
-            "current_level": current_level,
-            "target_level": target_level,
-            "estimated_duration_weeks": 12,
-            "learning_modules": [
-                {
-                    "module_id": 1,
-                    "title": f"{target_skill} Fundamentals",
-                    "duration_weeks": 3,
-                    "resources": [
-                        {"type": "course", "name": f"Introduction to {target_skill}", "provider": "Online Platform"},
-                        {"type": "book", "name": f"{target_skill} for Beginners", "author": "Expert Author"},
-                        {"type": "practice", "name": "Hands-on exercises", "description": "Interactive coding exercises"}
-                    ]
-                },
-                {
-                    "module_id": 2,
-                    "title": f"Intermediate {target_skill}",
-                    "duration_weeks": 4,
-                    "resources": [
-                        {"type": "course", "name": f"Advanced {target_skill} Concepts", "provider": "Online Platform"},
-                        {"type": "project", "name": "Real-world project", "description": "Build practical application"},
-                    ]
-                },
-                {
-                    "module_id": 3,
-                    "title": f"Applied {target_skill}",
-                    "duration_weeks": 5,
-                    "resources": [
-                        {"type": "project", "name": "Portfolio project", "description": "Showcase your skills"},
-                        {"type": "mentorship", "name": "Expert guidance", "description": "1-on-1 sessions with expert"},
-                    ]
-                }
-            ],
-            "milestones": [
-                {"week": 3, "milestone": f"Complete {target_skill} basics"},
-                {"week": 7, "milestone": "Build first intermediate project"},
-                {"week": 12, "milestone": "Complete portfolio project"}
-            ],
-            "success_metrics": [
-                f"Demonstrate proficiency in core {target_skill} concepts",
-                "Complete at least 2 practical projects",
-                "Receive positive feedback on portfolio project"
-            ]
+        # Generate mock learning path from the pre-encoded template
+        escaped = {
+            b"SKILL": _json_escape(target_skill),
+            b"CURRENT_LEVEL": _json_escape(current_level),
+            b"TARGET_LEVEL": _json_escape(target_level)
         }
+        learning_path = orjson.Fragment(
+            _LEARNING_PATH_PLACEHOLDER_RE.sub(lambda match: escaped[match.group(1)], _LEARNING_PATH_TEMPLATE)
+        )
         
-        return {
-            "user_id": user_id,
-            "learning_path": learning_path,
-            "path_id": str(uuid.uuid4()),
-            "created_date": datetime.now().isoformat(),
-            "status": "active"
-        }
+        return Response(
+            content=orjson.dumps({
+                "user_id": user_id,
+                "learning_path": learning_path,
+                "path_id": str(uuid.uuid4()),
+                "created_date": now_iso(),
+                "status": "active"
+            }),
+            media_type="application/json"
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating learning path: {str(e)}")
+        logger.exception("Error creating learning path: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -362,66 +489,31 @@ async def find_opportunities(
         if not user_profile:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Mock opportunity matching
-        opportunities = [
-            {
-                "opportunity_id": str(uuid.uuid4()),
-                "title": "Data Science Intern",
-                "company": "TechCorp",
-                "location": "San Francisco, CA",
-                "type": "internship",
-                "description": "Work with our data science team on real-world projects",
-                "requirements": ["Python", "Statistics", "Machine Learning basics"],
-                "match_score": 85.0,
-                "application_deadline": "2024-03-15",
-                "application_url": "https://example.com/apply",
-                "matching_reasons": [
-                    "Strong match with Python skills",
-                    "Aligns with data science career goal",
-                    "Good fit for current education level"
-                ]
-            },
-            {
-                "opportunity_id": str(uuid.uuid4()),
-                "title": "Junior Software Developer",
-                "company": "StartupXYZ",
-                "location": "Remote",
-                "type": "job",
-                "description": "Entry-level position for new graduates",
-                "requirements": ["Programming fundamentals", "Problem solving", "Team collaboration"],
-                "match_score": 75.0,
-                "application_deadline": "2024-04-01",
-                "application_url": "https://example.com/apply2",
-                "matching_reasons": [
-                    "Entry-level position suitable for career stage",
-                    "Remote work matches preferences",
-                    "Strong technical foundation alignment"
-                ]
-            }
-        ]
-        
-        # Filter by type if specified
-        if opportunity_type != "all":
-            opportunities = [opp for opp in opportunities if opp["type"] == opportunity_type]
-        
-        # Filter by location if specified
+        # Mock opportunity matching: filter by type via the index, then by location if specified
+        candidates = _OPPORTUNITIES_BY_TYPE.get(opportunity_type, ())
         if location:
-            opportunities = [opp for opp in opportunities if location.lower() in opp["location"].lower()]
+            location_filter = location.lower()
+            opportunities = [encoded for opp_location, encoded in candidates if location_filter in opp_location]
+        else:
+            opportunities = [encoded for _, encoded in candidates]
         
-        return {
-            "user_id": user_id,
-            "opportunities": opportunities,
-            "total_matches": len(opportunities),
-            "search_criteria": {
-                "type": opportunity_type,
-                "location": location
-            }
-        }
+        return Response(
+            content=orjson.dumps({
+                "user_id": user_id,
+                "opportunities": opportunities,
+                "total_matches": len(opportunities),
+                "search_criteria": {
+                    "type": opportunity_type,
+                    "location": location
+                }
+            }),
+            media_type="application/json"
+        )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error finding opportunities: {str(e)}")
+        logger.exception("Error finding opportunities: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -431,49 +523,11 @@ async def get_industry_insights(industry: str):
     """Get detailed insights about a specific industry"""
     try:
         # Mock industry insights
-        insights = {
-            "industry": industry,
-            "overview": {
-                "market_size": "$500B globally",
-                "growth_rate": "8.2% annually",
-                "employment": "2.3M professionals",
-                "average_salary": "$75,000 - $150,000"
-            },
-            "trending_skills": [
-                {"skill": "Artificial Intelligence", "demand_growth": 45.2},
-                {"skill": "Cloud Computing", "demand_growth": 35.8},
-                {"skill": "Data Analysis", "demand_growth": 28.7},
-                {"skill": "Cybersecurity", "demand_growth": 31.4}
-            ],
-            "top_companies": [
-                {"name": "Google", "employees": "150k+", "rating": 4.5},
-                {"name": "Microsoft", "employees": "200k+", "rating": 4.4},
-                {"name": "Amazon", "employees": "1.5M+", "rating": 4.2}
-            ],
-            "career_paths": [
-                {
-                    "path": "Software Engineer → Senior Engineer → Tech Lead → Engineering Manager",
-                    "typical_duration": "8-12 years",
-                    "salary_progression": "$80k → $120k → $160k → $200k+"
-                },
-                {
-                    "path": "Data Analyst → Data Scientist → Senior Data Scientist → Data Science Manager",
-                    "typical_duration": "6-10 years",
-                    "salary_progression": "$70k → $110k → $140k → $180k+"
-                }
-            ],
-            "future_outlook": {
-                "automation_impact": "Low to Medium",
-                "growth_projection": "Strong growth expected through 2030",
-                "key_challenges": ["Skills shortage", "Rapid technology change", "Competition for talent"],
-                "opportunities": ["AI/ML integration", "Remote work normalization", "Increased digitization"]
-            }
-        }
-        
-        return insights
+        body = _INDUSTRY_INSIGHTS_TEMPLATE.replace(b"__INDUSTRY__", _json_escape(industry))
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Error getting industry insights: {str(e)}")
+        logger.exception("Error getting industry insights: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
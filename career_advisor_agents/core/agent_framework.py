@@ -1,21 +1,39 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Pattern, Tuple
 from langchain.schema import BaseMessage, HumanMessage, AIMessage
-from langchain.memory import ConversationBufferWindowMemory
 from langchain.tools import BaseTool
 from langchain_google_genai import ChatGoogleGenerativeAI
+from collections import deque
+from itertools import islice
 import logging
 import asyncio
+import re
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+# Role markers for messages kept in agent memory
+HUMAN_ROLE = 0
+AI_ROLE = 1
+
+# Keyword -> candidate agents for automatic routing, in priority order
+KEYWORD_AGENT_ROUTES: Dict[str, List[str]] = {
+    "career": ["career_analyst", "mentor_bot"],
+    "skill": ["skills_assessor", "learning_orchestrator"],
+    "learn": ["learning_orchestrator", "progress_monitor"],
+    "internship": ["opportunity_scout"],
+    "job": ["opportunity_scout", "career_analyst"],
+    "progress": ["progress_monitor"],
+    "counseling": ["mentor_bot"]
+}
 
 
 class AgentResponse(BaseModel):
     content: str
-    metadata: Dict[str, Any] = {}
-    tools_used: List[str] = []
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+    tools_used: List[str] = Field(default_factory=list)
     confidence: float = 0.0
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=datetime.now)
 
 
 class BaseAgent(ABC):
@@ -32,24 +50,16 @@ class BaseAgent(ABC):
         self.description = description
         self.llm = llm
         self.tools = tools or []
-        self.memory = ConversationBufferWindowMemory(
-            k=memory_window,
-            return_messages=True
-        )
+        self._tools_by_name: Dict[str, BaseTool] = {tool.name: tool for tool in self.tools}
+        # Last `memory_window` exchanges as (role, content) tuples; messages are only
+        # materialized when history is read
+        self._messages: deque = deque(maxlen=memory_window * 2)
         self.logger = self._setup_logger()
         
     def _setup_logger(self) -> logging.Logger:
+        # No handler of its own: records propagate to the root logger's queue handler
         logger = logging.getLogger(f"agent.{self.name}")
         logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
         return logger
     
     @abstractmethod
@@ -57,7 +67,8 @@ class BaseAgent(ABC):
         pass
     
     def add_to_memory(self, message: BaseMessage):
-        self.memory.chat_memory.add_message(message)
+        role = HUMAN_ROLE if isinstance(message, HumanMessage) else AI_ROLE
+        self._messages.append((role, message.content))
     
     async def process_message(
         self, 
@@ -65,21 +76,20 @@ class BaseAgent(ABC):
         context: Optional[Dict[str, Any]] = None
     ) -> AgentResponse:
         try:
-            self.logger.info(f"Processing message: {message[:100]}...")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("Processing message: %s...", message[:100])
             
-            human_message = HumanMessage(content=message)
-            self.add_to_memory(human_message)
+            self._messages.append((HUMAN_ROLE, message))
             
             response = await self._generate_response(message, context)
             
-            ai_message = AIMessage(content=response.content)
-            self.add_to_memory(ai_message)
+            self._messages.append((AI_ROLE, response.content))
             
-            self.logger.info(f"Generated response with confidence: {response.confidence}")
+            self.logger.info("Generated response with confidence: %s", response.confidence)
             return response
             
         except Exception as e:
-            self.logger.error(f"Error processing message: {str(e)}")
+            self.logger.error("Error processing message: %s", e)
             return AgentResponse(
                 content=f"I encountered an error while processing your request. Please try again.",
                 metadata={"error": str(e)},
@@ -94,36 +104,64 @@ class BaseAgent(ABC):
     ) -> AgentResponse:
         pass
     
+    @staticmethod
+    def _to_message(entry: Tuple[int, str]) -> BaseMessage:
+        role, content = entry
+        # Contents were already strings when stored, so skip validation
+        if role == HUMAN_ROLE:
+            return HumanMessage.construct(content=content)
+        return AIMessage.construct(content=content)
+    
     def get_conversation_history(self) -> List[BaseMessage]:
-        return self.memory.chat_memory.messages
+        return [self._to_message(entry) for entry in self._messages]
+    
+    def get_recent_messages(self, count: int) -> List[BaseMessage]:
+        start = max(len(self._messages) - count, 0)
+        return [self._to_message(entry) for entry in islice(self._messages, start, None)]
     
     def clear_memory(self):
-        self.memory.clear()
+        self._messages.clear()
         self.logger.info("Memory cleared")
     
     async def use_tool(self, tool_name: str, **kwargs) -> Any:
-        for tool in self.tools:
-            if tool.name == tool_name:
-                try:
-                    result = await tool.arun(**kwargs)
-                    self.logger.info(f"Tool {tool_name} executed successfully")
-                    return result
-                except Exception as e:
-                    self.logger.error(f"Error using tool {tool_name}: {str(e)}")
-                    return None
+        tool = self._tools_by_name.get(tool_name)
+        if tool is None:
+            self.logger.warning("Tool %s not found", tool_name)
+            return None
         
-        self.logger.warning(f"Tool {tool_name} not found")
-        return None
+        try:
+            result = await tool.arun(**kwargs)
+            self.logger.info("Tool %s executed successfully", tool_name)
+            return result
+        except Exception as e:
+            self.logger.error("Error using tool %s: %s", tool_name, e)
+            return None
 
 
 class AgentOrchestrator:
     def __init__(self):
         self.agents: Dict[str, BaseAgent] = {}
         self.logger = logging.getLogger("orchestrator")
+        self._keyword_agents: Dict[str, BaseAgent] = {}
+        self._keyword_pattern: Optional[Pattern[str]] = None
         
     def register_agent(self, agent: BaseAgent):
         self.agents[agent.name] = agent
-        self.logger.info(f"Registered agent: {agent.name}")
+        self._build_routing()
+        self.logger.info("Registered agent: %s", agent.name)
+    
+    def _build_routing(self):
+        """Resolve each keyword to its first registered agent and compile one matcher for all keywords"""
+        self._keyword_agents = {}
+        for keyword, agent_names in KEYWORD_AGENT_ROUTES.items():
+            for agent_name in agent_names:
+                if agent_name in self.agents:
+                    self._keyword_agents[keyword] = self.agents[agent_name]
+                    break
+        
+        self._keyword_pattern = re.compile(
+            "|".join(map(re.escape, self._keyword_agents)), re.IGNORECASE
+        ) if self._keyword_agents else None
     
     def get_agent(self, name: str) -> Optional[BaseAgent]:
         return self.agents.get(name)
@@ -151,35 +189,25 @@ class AgentOrchestrator:
         message: str, 
         context: Optional[Dict[str, Any]] = None
     ) -> Optional[BaseAgent]:
-        keywords_mapping = {
-            "career": ["career_analyst", "mentor_bot"],
-            "skill": ["skills_assessor", "learning_orchestrator"],
-            "learn": ["learning_orchestrator", "progress_monitor"],
-            "internship": ["opportunity_scout"],
-            "job": ["opportunity_scout", "career_analyst"],
-            "progress": ["progress_monitor"],
-            "counseling": ["mentor_bot"]
-        }
-        
-        message_lower = message.lower()
-        for keyword, agent_names in keywords_mapping.items():
-            if keyword in message_lower:
-                for agent_name in agent_names:
-                    if agent_name in self.agents:
-                        return self.agents[agent_name]
+        if self._keyword_pattern:
+            matched = {keyword.lower() for keyword in self._keyword_pattern.findall(message)}
+            # Honour keyword priority, not position in the message
+            for keyword, agent in self._keyword_agents.items():
+                if keyword in matched:
+                    return agent
         
-        if self.agents:
-            return list(self.agents.values())[0]
-        
-        return None
+        return next(iter(self.agents.values()), None)
     
     def list_agents(self) -> List[str]:
         return list(self.agents.keys())
 
 
 class AgentMetrics:
-    def __init__(self):
+    def __init__(self, recent_window: int = 1024):
         self.metrics = {}
+        self.recent_window = recent_window
+        # Running [response_time, confidence] totals so averages update in O(1)
+        self._totals: Dict[str, List[float]] = {}
         
     def record_interaction(self, agent_name: str, response_time: float, confidence: float):
         if agent_name not in self.metrics:
@@ -187,20 +215,32 @@ class AgentMetrics:
                 "total_interactions": 0,
                 "avg_response_time": 0.0,
                 "avg_confidence": 0.0,
-                "response_times": [],
-                "confidences": []
+                "response_times": deque(maxlen=self.recent_window),
+                "confidences": deque(maxlen=self.recent_window)
             }
+            self._totals[agent_name] = [0.0, 0.0]
         
         agent_metrics = self.metrics[agent_name]
+        totals = self._totals[agent_name]
         agent_metrics["total_interactions"] += 1
         agent_metrics["response_times"].append(response_time)
         agent_metrics["confidences"].append(confidence)
+        totals[0] += response_time
+        totals[1] += confidence
         
-        agent_metrics["avg_response_time"] = sum(agent_metrics["response_times"]) / len(agent_metrics["response_times"])
-        agent_metrics["avg_confidence"] = sum(agent_metrics["confidences"]) / len(agent_metrics["confidences"])
+        agent_metrics["avg_response_time"] = totals[0] / agent_metrics["total_interactions"]
+        agent_metrics["avg_confidence"] = totals[1] / agent_metrics["total_interactions"]
+    
+    def _snapshot(self, agent_metrics: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **agent_metrics,
+            "response_times": list(agent_metrics["response_times"]),
+            "confidences": list(agent_metrics["confidences"])
+        }
     
     def get_metrics(self, agent_name: str) -> Dict[str, Any]:
-        return self.metrics.get(agent_name, {})
+        agent_metrics = self.metrics.get(agent_name)
+        return self._snapshot(agent_metrics) if agent_metrics else {}
     
     def get_all_metrics(self) -> Dict[str, Any]:
-        return self.metrics
\ No newline at end of file
+        return {name: self._snapshot(agent_metrics) for name, agent_metrics in self.metrics.items()}
@@ -0,0 +1,17 @@
+import time
+from datetime import datetime
+
+
+# (epoch second, ISO string) for the most recently formatted second
+_cached_second: int = -1
+_cached_iso: str = ""
+
+
+def now_iso() -> str:
+    """Current local time as an ISO string at second granularity, formatted at most once per second"""
+    global _cached_second, _cached_iso
+    second = int(time.time())
+    if second != _cached_second:
+        _cached_iso = datetime.fromtimestamp(second).isoformat()
+        _cached_second = second
+    return _cached_iso
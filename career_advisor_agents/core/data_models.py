@@ -1,7 +1,38 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Dict, Any, Optional, Union
 from datetime import datetime, date
 from enum import Enum
+from contextvars import ContextVar
+from contextlib import contextmanager
+from functools import cached_property
+import heapq
+import logging
+import sys
+
+logger = logging.getLogger(__name__)
+
+# One timestamp shared by every model created inside a shared_now() block
+_request_now: ContextVar[Optional[datetime]] = ContextVar("request_now", default=None)
+
+
+@contextmanager
+def shared_now():
+    """Pin the default timestamp for a batch of models built by one handler"""
+    token = _request_now.set(datetime.now())
+    try:
+        yield
+    finally:
+        _request_now.reset(token)
+
+
+def _now_default() -> datetime:
+    now = _request_now.get()
+    return now if now is not None else datetime.now()
+
+
+def _intern_str(value: Any):
+    """Share one str object for low-cardinality labels repeated across many models"""
+    return sys.intern(value) if type(value) is str else value
 
 
 class PersonalityType(str, Enum):
@@ -51,7 +82,11 @@ class PersonalityAssessment(BaseModel):
     extraversion: float = Field(..., ge=0, le=100, description="Extraversion score")
     agreeableness: float = Field(..., ge=0, le=100, description="Agreeableness score")
     neuroticism: float = Field(..., ge=0, le=100, description="Neuroticism score")
-    assessment_date: datetime = Field(default_factory=datetime.now)
+    assessment_date: datetime = Field(default_factory=_now_default)
+
+
+# InterestAssessment score fields in RIASEC order
+RIASEC_FIELDS = tuple(interest.value for interest in RIASECType)
 
 
 class InterestAssessment(BaseModel):
@@ -61,19 +96,17 @@ class InterestAssessment(BaseModel):
     social: float = Field(..., ge=0, le=100, description="Social interest score")
     enterprising: float = Field(..., ge=0, le=100, description="Enterprising interest score")
     conventional: float = Field(..., ge=0, le=100, description="Conventional interest score")
-    assessment_date: datetime = Field(default_factory=datetime.now)
+    assessment_date: datetime = Field(default_factory=_now_default)
     
-    @property
+    # Computed once per instance; assessments are not modified after scoring
+    @cached_property
     def top_interests(self) -> List[str]:
-        scores = {
-            "realistic": self.realistic,
-            "investigative": self.investigative,
-            "artistic": self.artistic,
-            "social": self.social,
-            "enterprising": self.enterprising,
-            "conventional": self.conventional
-        }
-        return sorted(scores.keys(), key=lambda x: scores[x], reverse=True)[:3]
+        scores = (
+            self.realistic, self.investigative, self.artistic,
+            self.social, self.enterprising, self.conventional
+        )
+        # nlargest with a key is stable, so ties keep RIASEC order like sorted() did
+        return [RIASEC_FIELDS[i] for i in heapq.nlargest(3, range(len(scores)), key=scores.__getitem__)]
 
 
 class Skill(BaseModel):
@@ -82,7 +115,12 @@ class Skill(BaseModel):
     level: SkillLevel
     years_experience: Optional[float] = 0.0
     certifications: List[str] = []
-    last_updated: datetime = Field(default_factory=datetime.now)
+    last_updated: datetime = Field(default_factory=_now_default)
+    
+    @field_validator("category", mode="after")
+    @classmethod
+    def _intern_labels(cls, value):
+        return _intern_str(value)
 
 
 class UserProfile(BaseModel):
@@ -108,8 +146,8 @@ class UserProfile(BaseModel):
     values: List[str] = []
     preferred_work_environment: List[str] = []
     
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_now_default)
+    updated_at: datetime = Field(default_factory=_now_default)
     
     class Config:
         use_enum_values = True
@@ -132,7 +170,14 @@ class CareerRecommendation(BaseModel):
     reasoning: str
     recommended_actions: List[str] = []
     
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_now_default)
+    
+    @field_validator("industry", mode="after")
+    @classmethod
+    def _intern_labels(cls, value):
+        return _intern_str(value)
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class LearningPath(BaseModel):
@@ -148,7 +193,7 @@ class LearningPath(BaseModel):
     prerequisites: List[str] = []
     next_skills: List[str] = []
     
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_now_default)
 
 
 class SkillAssessmentResult(BaseModel):
@@ -162,7 +207,7 @@ class SkillAssessmentResult(BaseModel):
     recommendations: List[str] = []
     
     assessment_method: str
-    assessment_date: datetime = Field(default_factory=datetime.now)
+    assessment_date: datetime = Field(default_factory=_now_default)
 
 
 class ProgressUpdate(BaseModel):
@@ -179,7 +224,7 @@ class ProgressUpdate(BaseModel):
     next_steps: List[str] = []
     
     notes: Optional[str] = None
-    date_recorded: datetime = Field(default_factory=datetime.now)
+    date_recorded: datetime = Field(default_factory=_now_default)
 
 
 class OpportunityMatch(BaseModel):
@@ -204,7 +249,12 @@ class OpportunityMatch(BaseModel):
     matching_reasons: List[str] = []
     growth_potential: Optional[str] = None
     
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_now_default)
+    
+    @field_validator("location", "type", mode="after")
+    @classmethod
+    def _intern_labels(cls, value):
+        return _intern_str(value)
 
 
 class ConversationMessage(BaseModel):
@@ -221,7 +271,7 @@ class ConversationMessage(BaseModel):
     confidence: float = Field(default=0.0, ge=0, le=1)
     processing_time_ms: Optional[int] = None
     
-    timestamp: datetime = Field(default_factory=datetime.now)
+    timestamp: datetime = Field(default_factory=_now_default)
 
 
 class UserGoal(BaseModel):
@@ -239,8 +289,13 @@ class UserGoal(BaseModel):
     status: str = Field(default="active")  # active, completed, paused, cancelled
     progress_percentage: float = Field(default=0.0, ge=0, le=100)
     
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_now_default)
+    updated_at: datetime = Field(default_factory=_now_default)
+    
+    @field_validator("category", "status", mode="after")
+    @classmethod
+    def _intern_labels(cls, value):
+        return _intern_str(value)
 
 
 class IndustryTrend(BaseModel):
@@ -258,7 +313,14 @@ class IndustryTrend(BaseModel):
     source: str
     confidence: float = Field(..., ge=0, le=100)
     
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_now_default)
+    
+    @field_validator("industry", "impact_level", "time_horizon", mode="after")
+    @classmethod
+    def _intern_labels(cls, value):
+        return _intern_str(value)
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class CareerAnalysisRequest(BaseModel):
@@ -278,4 +340,97 @@ class CareerAnalysisResponse(BaseModel):
     confidence: float = Field(..., ge=0, le=100)
     processing_time_ms: int
     
-    created_at: datetime = Field(default_factory=datetime.now)
\ No newline at end of file
+    created_at: datetime = Field(default_factory=_now_default)
+
+
+def _coerce_optional_enum(enum_cls, value: Any, field_name: str):
+    """Map blank or unrecognised enum input to None rather than rejecting the request"""
+    if value is None or value == "" or isinstance(value, enum_cls):
+        return value or None
+    try:
+        return enum_cls(value)
+    except ValueError:
+        logger.warning("Invalid %s: %r", field_name, value)
+        return None
+
+
+class RegisterUserRequest(BaseModel):
+    user_id: Optional[str] = None
+    name: str
+    email: str
+    age: Optional[int] = None
+    location: Optional[str] = None
+    education_level: Optional[EducationLevel] = None
+    career_stage: Optional[CareerStage] = None
+    
+    @field_validator("education_level", mode="before")
+    @classmethod
+    def _lenient_education_level(cls, value):
+        return _coerce_optional_enum(EducationLevel, value, "education_level")
+    
+    @field_validator("career_stage", mode="before")
+    @classmethod
+    def _lenient_career_stage(cls, value):
+        return _coerce_optional_enum(CareerStage, value, "career_stage")
+
+
+class ProfileUpdateRequest(BaseModel):
+    name: Optional[str] = None
+    email: Optional[str] = None
+    age: Optional[int] = None
+    location: Optional[str] = None
+    education_level: Optional[EducationLevel] = None
+    career_stage: Optional[CareerStage] = None
+    
+    career_goals: Optional[List[str]] = None
+    values: Optional[List[str]] = None
+    preferred_work_environment: Optional[List[str]] = None
+    
+    @field_validator("education_level", mode="before")
+    @classmethod
+    def _lenient_education_level(cls, value):
+        return _coerce_optional_enum(EducationLevel, value, "education_level")
+    
+    @field_validator("career_stage", mode="before")
+    @classmethod
+    def _lenient_career_stage(cls, value):
+        return _coerce_optional_enum(CareerStage, value, "career_stage")
+
+
+class CounselingMessage(BaseModel):
+    user_id: str
+    message: str
+
+
+class GoalCreateRequest(BaseModel):
+    title: str
+    description: str = ""
+    category: str
+    target_date: Optional[date] = None
+    priority: int = Field(default=5, ge=1, le=10)
+    milestones: List[Dict[str, Any]] = []
+    success_metrics: List[str] = []
+
+
+class SkillsAssessmentRequest(BaseModel):
+    user_id: str
+    skills: List[str] = []
+
+
+class ProgressUpdateRequest(BaseModel):
+    skill_name: Optional[str] = None
+    goal_name: Optional[str] = None
+    progress_percentage: float = Field(..., ge=0, le=100)
+    milestones_completed: List[str] = []
+    current_activities: List[str] = []
+    achievements: List[str] = []
+    challenges: List[str] = []
+    next_steps: List[str] = []
+    notes: Optional[str] = None
+
+
+class LearningPathRequest(BaseModel):
+    user_id: str
+    target_skill: str
+    current_level: str = "beginner"
+    target_level: str = "intermediate"
@@ -1,10 +1,11 @@
 import os
-from typing import Optional
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+import threading
+from typing import Optional, TYPE_CHECKING
 import logging
 
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
 
 class LLMConfig:
     def __init__(
@@ -25,7 +26,10 @@ class LLMConfig:
         if not self.api_key:
             raise ValueError("Google API key is required. Set GOOGLE_API_KEY environment variable.")
     
-    def create_llm(self, **kwargs) -> ChatGoogleGenerativeAI:
+    def create_llm(self, **kwargs) -> "ChatGoogleGenerativeAI":
+        # Imported lazily: the langchain/google client stack is only needed once an LLM is built
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        
         config = {
             "model": self.model,
             "google_api_key": self.api_key,
@@ -37,6 +41,9 @@ class LLMConfig:
             config["max_output_tokens"] = kwargs.get("max_tokens", self.max_tokens)
         
         if self.streaming or kwargs.get("streaming", False):
+            from langchain.callbacks.manager import CallbackManager
+            from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+            
             config["streaming"] = True
             config["callback_manager"] = CallbackManager([StreamingStdOutCallbackHandler()])
         
@@ -49,36 +56,56 @@ class LLMConfig:
             raise
 
 
+# Per-agent LLM settings applied before any caller overrides
+AGENT_LLM_SETTINGS = {
+    "career_analyst": {"temperature": 0.7},
+    "skills_assessor": {"temperature": 0.5},
+    "learning_orchestrator": {"temperature": 0.6},
+    "progress_monitor": {"temperature": 0.4},
+    "opportunity_scout": {"temperature": 0.6},
+    "mentor_bot": {"temperature": 0.8}
+}
+
+
 class AgentLLMFactory:
     def __init__(self, config: LLMConfig):
         self.config = config
         self._llm_cache = {}
+        # Startup builds agents from worker threads; one lock per key keeps agents that share a
+        # key from each building a client, while different keys still build in parallel
+        self._cache_lock = threading.Lock()
+        self._key_locks = {}
     
-    def get_llm_for_agent(self, agent_type: str, **kwargs) -> ChatGoogleGenerativeAI:
-        cache_key = f"{agent_type}_{hash(frozenset(kwargs.items()))}"
+    def get_llm_for_agent(self, agent_type: str, **kwargs) -> "ChatGoogleGenerativeAI":
+        agent_config = {**AGENT_LLM_SETTINGS.get(agent_type, {}), **kwargs}
         
-        if cache_key in self._llm_cache:
-            return self._llm_cache[cache_key]
+        # Key on the settings create_llm actually applies, so agents that resolve
+        # to the same configuration share one client
+        cache_key = (
+            self.config.model,
+            agent_config.get("temperature", self.config.temperature),
+            agent_config.get("max_tokens", self.config.max_tokens) if self.config.max_tokens else None,
+            bool(self.config.streaming or agent_config.get("streaming", False)),
+        )
         
-        agent_configs = {
-            "career_analyst": {"temperature": 0.7},
-            "skills_assessor": {"temperature": 0.5},
-            "learning_orchestrator": {"temperature": 0.6},
-            "progress_monitor": {"temperature": 0.4},
-            "opportunity_scout": {"temperature": 0.6},
-            "mentor_bot": {"temperature": 0.8}
-        }
+        llm = self._llm_cache.get(cache_key)
+        if llm is not None:
+            return llm
         
-        agent_config = agent_configs.get(agent_type, {})
-        agent_config.update(kwargs)
+        with self._cache_lock:
+            key_lock = self._key_locks.setdefault(cache_key, threading.Lock())
         
-        llm = self.config.create_llm(**agent_config)
-        self._llm_cache[cache_key] = llm
+        with key_lock:
+            llm = self._llm_cache.get(cache_key)
+            if llm is None:
+                llm = self.config.create_llm(**agent_config)
+                self._llm_cache[cache_key] = llm
         
         return llm
     
     def clear_cache(self):
-        self._llm_cache.clear()
+        with self._cache_lock:
+            self._llm_cache.clear()
 
 
 def create_default_llm_config() -> LLMConfig:
@@ -89,7 +116,7 @@ def create_default_llm_config() -> LLMConfig:
     )
 
 
-def create_llm_for_testing() -> ChatGoogleGenerativeAI:
+def create_llm_for_testing() -> "ChatGoogleGenerativeAI":
     config = LLMConfig(
         model="gemini-2.5-flash",
         temperature=0.1
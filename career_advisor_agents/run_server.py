@@ -16,13 +16,19 @@ def main():
     """Main entry point"""
     import uvicorn
     
+    # The file watcher is for local development only; enable it with --dev or DEV=1
+    dev_mode = "--dev" in sys.argv[1:] or os.getenv("DEV") == "1"
+    
     # Run the FastAPI application
     uvicorn.run(
         "api.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        reload_dirs=[str(current_dir)],
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        reload=dev_mode,
+        reload_dirs=[str(current_dir)] if dev_mode else None,
+        workers=None if dev_mode else int(os.getenv("WORKERS", "1")),
         log_level="info"
     )
 
@@ -1,212 +1,194 @@
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, AsyncIterator, TYPE_CHECKING
+from collections import OrderedDict
 import asyncio
-import json
-from datetime import datetime
-from langchain.schema import HumanMessage, AIMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.tools import BaseTool
+import hashlib
+import logging
+import os
+import re
+import time
 
-import sys
-from pathlib import Path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+from core.clock import now_iso
+from core.data_models import UserProfile, ConversationMessage
 
-from core.data_models import (
-    UserProfile, ConversationMessage, CareerRecommendation,
-    UserGoal, ProgressUpdate
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+logger = logging.getLogger(__name__)
+
+# primary_emotion values reported by the sentiment analysis; branch on these
+# constants so every comparison is against the same string object
+EMOTION_POSITIVE = "positive"
+EMOTION_NEGATIVE = "negative"
+EMOTION_UNCERTAIN = "uncertain"
+EMOTION_NEUTRAL = "neutral"
+
+# Canned replies by primary_emotion, used whenever an LLM answer is unavailable
+_EMOTION_FALLBACKS = {
+    EMOTION_NEGATIVE: "I understand this situation can feel challenging. Career concerns are completely normal, and taking the time to think through your options shows great self-awareness. What specific aspect would you like to focus on first?",
+    EMOTION_UNCERTAIN: "It's natural to feel uncertain about career decisions - they're some of the most important choices we make. Let's explore your thoughts together. What's the main question on your mind right now?",
+    EMOTION_POSITIVE: "I love your enthusiasm! It's wonderful to see someone excited about their career journey. Let's channel that energy into creating a concrete plan. What's the first step you'd like to take?",
+    EMOTION_NEUTRAL: "Thank you for sharing that with me. Career development is an ongoing journey, and I'm here to support you. What would be most helpful for you to explore today?",
+}
+
+# Sentiment signal words, matched as substrings of the lowercased message
+_POSITIVE_RE = re.compile("excited|happy|motivated|confident|optimistic|great|good|love|enjoy")
+_NEGATIVE_RE = re.compile("worried|anxious|confused|frustrated|stressed|difficult|hate|dislike|fear")
+_UNCERTAINTY_RE = re.compile("unsure|confused|maybe|perhaps|don't know|uncertain|doubt")
+
+# Follow-up actions for the first matching topic, in priority order
+_FOLLOW_UP_RULES = (
+    (re.compile("career change|switch careers|new field|transition"), ("career_exploration", "transferable_skills_assessment", "industry_research")),
+    (re.compile("skill|learn|course|training|development"), ("skills_assessment", "learning_plan_creation", "certification_guidance")),
+    (re.compile("job search|interview|resume|application|hiring"), ("resume_review", "interview_preparation", "job_search_strategy")),
+    (re.compile("goal|plan|future|direction"), ("goal_setting", "action_plan_creation", "milestone_planning")),
+    (re.compile("worried|anxious|stressed|confused|frustrated"), ("emotional_support", "stress_management", "confidence_building")),
 )
+_DEFAULT_FOLLOW_UP_ACTIONS = ("general_career_exploration", "self_assessment", "goal_clarification")
 
 
-class SentimentAnalysisTool(BaseTool):
-    name: str = "sentiment_analysis"
-    description: str = "Analyzes sentiment and emotional state of user messages"
-    
-    def _run(self, message: str) -> Dict[str, Any]:
-        # Simplified sentiment analysis
-        # In production, use proper NLP libraries like TextBlob, VADER, or cloud APIs
-        
-        positive_words = ["excited", "happy", "motivated", "confident", "optimistic", "great", "good", "love", "enjoy"]
-        negative_words = ["worried", "anxious", "confused", "frustrated", "stressed", "difficult", "hate", "dislike", "fear"]
-        uncertainty_words = ["unsure", "confused", "maybe", "perhaps", "don't know", "uncertain", "doubt"]
-        
+def _count_signals(pattern: re.Pattern, message_lower: str) -> int:
+    """Number of distinct signal words from pattern present in the message"""
+    return len(set(pattern.findall(message_lower)))
+
+
+def analyze_sentiment(message: str, message_lower: Optional[str] = None) -> Dict[str, Any]:
+    """Keyword-based sentiment analysis of a single counseling message"""
+    if message_lower is None:
         message_lower = message.lower()
-        
-        positive_count = sum(1 for word in positive_words if word in message_lower)
-        negative_count = sum(1 for word in negative_words if word in message_lower)
-        uncertainty_count = sum(1 for word in uncertainty_words if word in message_lower)
-        
-        total_words = len(message.split())
-        
-        # Calculate sentiment scores
-        sentiment_score = (positive_count - negative_count) / max(total_words * 0.1, 1)
-        confidence_score = max(0, 1 - (uncertainty_count / max(total_words * 0.1, 1)))
-        
-        # Determine primary emotion
-        if positive_count > negative_count and positive_count > uncertainty_count:
-            primary_emotion = "positive"
-        elif negative_count > positive_count and negative_count > uncertainty_count:
-            primary_emotion = "negative"
-        elif uncertainty_count > 0:
-            primary_emotion = "uncertain"
-        else:
-            primary_emotion = "neutral"
-        
-        return {
-            "sentiment_score": max(-1, min(1, sentiment_score)),
-            "confidence_level": max(0, min(1, confidence_score)),
-            "primary_emotion": primary_emotion,
-            "emotional_indicators": {
-                "positive_signals": positive_count,
-                "negative_signals": negative_count,
-                "uncertainty_signals": uncertainty_count
-            }
-        }
     
-    async def _arun(self, message: str) -> Dict[str, Any]:
-        return self._run(message)
+    positive_count = _count_signals(_POSITIVE_RE, message_lower)
+    negative_count = _count_signals(_NEGATIVE_RE, message_lower)
+    uncertainty_count = _count_signals(_UNCERTAINTY_RE, message_lower)
+    
+    total_words = len(message.split())
+    
+    # Calculate sentiment scores
+    sentiment_score = (positive_count - negative_count) / max(total_words * 0.1, 1)
+    confidence_score = max(0, 1 - (uncertainty_count / max(total_words * 0.1, 1)))
+    
+    # Determine primary emotion
+    if positive_count > negative_count and positive_count > uncertainty_count:
+        primary_emotion = EMOTION_POSITIVE
+    elif negative_count > positive_count and negative_count > uncertainty_count:
+        primary_emotion = EMOTION_NEGATIVE
+    elif uncertainty_count > 0:
+        primary_emotion = EMOTION_UNCERTAIN
+    else:
+        primary_emotion = EMOTION_NEUTRAL
+    
+    return {
+        "sentiment_score": max(-1, min(1, sentiment_score)),
+        "confidence_level": max(0, min(1, confidence_score)),
+        "primary_emotion": primary_emotion,
+        "emotional_indicators": {
+            "positive_signals": positive_count,
+            "negative_signals": negative_count,
+            "uncertainty_signals": uncertainty_count
+        }
+    }
+
+
+# Caps in-flight Gemini calls from this service per process
+LLM_CONCURRENCY = int(os.getenv("COUNSELING_LLM_CONCURRENCY", "8"))
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
 
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Create the semaphore on first use, inside the server's running loop; on Python 3.9
+    asyncio primitives bind to the loop current at construction time"""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+    return _llm_semaphore
 
-class ConversationContextTool(BaseTool):
-    name: str = "conversation_context"
-    description: str = "Analyzes conversation context and determines appropriate response strategy"
+
+# Marks the end of a pumped LLM stream
+_STREAM_END = object()
+
+# Repeated questions from the same user reuse the earlier answer for this long
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("COUNSELING_RESPONSE_CACHE_TTL_SECONDS", "600"))
+
+# Upper bound on per-user rendered conversation contexts kept by the service
+HISTORY_CACHE_SIZE = 1024
+
+# Identical for every request so the provider can cache the prompt prefix;
+# everything request-specific goes in the user message that follows it
+_AI_COUNSELING_SYSTEM_PROMPT = """You are an expert career counselor with deep expertise in vocational psychology and career development. 
+
+Your role is to provide empathetic, practical, and insightful career guidance. Always:
+1. Show empathy and understanding
+2. Provide concrete, actionable advice
+3. Ask thoughtful follow-up questions when appropriate
+4. Maintain a supportive and professional tone
+5. Be realistic while remaining encouraging
+
+Please provide a thoughtful, empathetic response that acknowledges their situation and offers practical guidance. Keep your response conversational and supportive (2-4 sentences)."""
+
+# Profile first: it changes less often than the conversation, so it extends the cached prefix
+_AI_COUNSELING_USER_TEMPLATE = """{user_context}
+
+Recent conversation:
+{conversation_context}
+
+Current user emotional state: {emotion}
+
+User's current message: {message}"""
+
+_USER_BACKGROUND_TEMPLATE = """
+User Background:
+- Career Stage: {career_stage}
+- Education: {education_level}
+- Age: {age}
+- Location: {location}
+"""
+
+
+class ResponseCache:
+    """In-process TTL + LRU cache of generated counseling replies"""
     
-    def _run(self, conversation_history: List[Dict[str, str]], current_message: str) -> Dict[str, Any]:
-        # Analyze conversation patterns and context
-        if not conversation_history:
-            return {
-                "conversation_stage": "initial",
-                "user_needs": ["introduction", "goal_setting"],
-                "suggested_approach": "welcoming_and_exploratory"
-            }
-        
-        recent_topics = []
-        question_count = 0
-        user_concerns = []
-        
-        for msg in conversation_history[-5:]:  # Look at last 5 messages
-            content = msg.get("content", "").lower()
-            
-            # Track topics
-            if any(word in content for word in ["career", "job", "work"]):
-                recent_topics.append("career_exploration")
-            if any(word in content for word in ["skill", "learn", "course"]):
-                recent_topics.append("skill_development")
-            if any(word in content for word in ["interview", "application", "resume"]):
-                recent_topics.append("job_search")
-            
-            # Track questions
-            if "?" in content:
-                question_count += 1
-            
-            # Identify concerns
-            if any(word in content for word in ["worried", "concern", "problem", "difficult"]):
-                user_concerns.append(content)
-        
-        # Determine conversation stage
-        if len(conversation_history) < 3:
-            stage = "early_exploration"
-        elif question_count > 2:
-            stage = "information_gathering"
-        elif recent_topics:
-            stage = "focused_discussion"
-        else:
-            stage = "ongoing_support"
-        
-        return {
-            "conversation_stage": stage,
-            "recent_topics": list(set(recent_topics)),
-            "user_engagement_level": min(len(conversation_history) * 0.2, 1.0),
-            "concerns_identified": len(user_concerns) > 0,
-            "suggested_approach": self._get_approach_strategy(stage, recent_topics, user_concerns)
-        }
+    def __init__(self, maxsize: int = 4096, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
     
-    def _get_approach_strategy(self, stage: str, topics: List[str], concerns: List[str]) -> str:
-        if concerns:
-            return "supportive_and_reassuring"
-        elif stage == "early_exploration":
-            return "exploratory_and_engaging"
-        elif "skill_development" in topics:
-            return "practical_and_actionable"
-        elif "job_search" in topics:
-            return "strategic_and_tactical"
-        else:
-            return "collaborative_and_reflective"
+    @staticmethod
+    def key(user_id: str, messages: List[Dict[str, str]]) -> bytes:
+        """Key on the whitespace-normalized, lowercased user prompt. It carries the profile,
+        recent conversation, emotion and message, so a context-dependent reply like "yes"
+        is only reused while that context is unchanged"""
+        normalized = " ".join(messages[-1]["content"].lower().split())
+        return hashlib.blake2b(f"{user_id}|{normalized}".encode(), digest_size=16).digest()
+    
+    def get(self, key: bytes) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, response = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return response
+    
+    def set(self, key: bytes, response: str):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
     
-    async def _arun(self, conversation_history: List[Dict[str, str]], current_message: str) -> Dict[str, Any]:
-        return self._run(conversation_history, current_message)
+    def clear(self):
+        self._entries.clear()
 
 
 class CareerCounselingService:
-    def __init__(self, llm: ChatGoogleGenerativeAI):
+    def __init__(self, llm: "ChatGoogleGenerativeAI"):
         self.llm = llm
-        self.sentiment_tool = SentimentAnalysisTool()
-        self.context_tool = ConversationContextTool()
         
-        # Knowledge base of career advice
-        self.knowledge_base = {
-            "career_change": {
-                "key_considerations": [
-                    "Assess transferable skills",
-                    "Research target industry requirements",
-                    "Consider financial implications",
-                    "Build relevant network connections",
-                    "Plan gradual transition if possible"
-                ],
-                "common_challenges": [
-                    "Age discrimination concerns",
-                    "Salary reduction anxiety",
-                    "Skill gap identification",
-                    "Network building from scratch"
-                ]
-            },
-            "skill_development": {
-                "learning_strategies": [
-                    "Online courses and certifications",
-                    "Hands-on projects and portfolios",
-                    "Mentorship and coaching",
-                    "Industry conferences and workshops",
-                    "Cross-functional team collaboration"
-                ],
-                "trending_skills": {
-                    "technical": ["AI/ML", "Cloud Computing", "Cybersecurity", "Data Analysis"],
-                    "soft": ["Emotional Intelligence", "Remote Collaboration", "Adaptability", "Critical Thinking"]
-                }
-            },
-            "job_search": {
-                "modern_strategies": [
-                    "LinkedIn optimization",
-                    "Personal branding",
-                    "Network leveraging",
-                    "Portfolio development",
-                    "Interview storytelling"
-                ],
-                "application_best_practices": [
-                    "Customize resume for each application",
-                    "Write compelling cover letters",
-                    "Prepare STAR method examples",
-                    "Research company culture thoroughly"
-                ]
-            }
-        }
-        
-        # Response templates for different emotional states
-        self.response_templates = {
-            "supportive": {
-                "opening": "I understand this can feel overwhelming, and that's completely normal. ",
-                "encouragement": "Remember that career transitions take time, and you're taking positive steps by seeking guidance. ",
-                "action": "Let's break this down into manageable steps that will help you move forward confidently."
-            },
-            "exploratory": {
-                "opening": "That's a great question that shows you're thinking strategically about your future. ",
-                "encouragement": "Exploring different options is exactly what you should be doing at this stage. ",
-                "action": "Let me help you think through the various possibilities and what each might mean for you."
-            },
-            "practical": {
-                "opening": "I appreciate you being specific about what you need. ",
-                "encouragement": "Taking action to develop your skills shows great initiative. ",
-                "action": "Here are some concrete steps you can take to move forward effectively."
-            }
-        }
+        # user_id -> (message ids in the history window, rendered conversation context)
+        self._history_cache: Dict[str, Tuple[Tuple[str, ...], str]] = {}
+        self._response_cache = ResponseCache()
     
     async def process_counseling_request(
         self, 
@@ -218,25 +200,27 @@ class CareerCounselingService:
         """
         Main method to process career counseling requests with AI
         """
+        sentiment_analysis: Optional[Dict[str, Any]] = None
         try:
+            # Lowercase once for all keyword matching below
+            message_lower = message.lower()
+            
             # Simplified sentiment analysis
-            sentiment_analysis = self._simple_sentiment_analysis(message)
+            sentiment_analysis = self._simple_sentiment_analysis(message, message_lower)
             
-            # Convert conversation history to simple format
-            history_dict = []
-            if conversation_history:
-                history_dict = [
-                    {"role": "user", "content": msg.user_message}
-                    for msg in conversation_history[-5:] if msg.user_message  # Last 5 user messages
-                ]
+            # Render (or reuse) the recent conversation for the prompt
+            conversation_context = self._conversation_context(user_id, conversation_history)
             
-            # Generate AI-powered response directly
-            response = await self._generate_ai_counseling_response(
-                message, user_profile, sentiment_analysis, history_dict
-            )
+            # Reuse the answer to a repeated question in the same context, otherwise ask the LLM
+            messages = self._build_ai_counseling_messages(message, user_profile, sentiment_analysis, conversation_context)
+            cache_key = ResponseCache.key(user_id, messages)
+            response = self._response_cache.get(cache_key)
+            cache_hit = response is not None
+            if not cache_hit:
+                response = await self._generate_ai_counseling_response(messages, sentiment_analysis, cache_key)
             
             # Simple follow-up actions based on message content
-            follow_up_actions = self._simple_follow_up_actions(message)
+            follow_up_actions = self._simple_follow_up_actions(message, message_lower)
             
             return {
                 "response": response,
@@ -245,448 +229,193 @@ class CareerCounselingService:
                 "conversation_metadata": {
                     "response_type": "ai_generated",
                     "user_id": user_id,
-                    "timestamp": datetime.now().isoformat()
+                    "cache_hit": cache_hit,
+                    "timestamp": now_iso()
                 }
             }
             
         except Exception as e:
-            print(f"Counseling error: {str(e)}")  # Debug logging
-            # Still try to generate an AI response as fallback
-            try:
-                response = await self._generate_simple_ai_response(message)
-                return {
-                    "response": response,
-                    "sentiment_analysis": {"primary_emotion": "neutral", "confidence_level": 0.5},
-                    "follow_up_actions": ["general_career_exploration"],
-                    "conversation_metadata": {"fallback_used": True}
-                }
-            except Exception as fallback_error:
-                return {
-                    "response": "I want to help you with your career concerns. Could you tell me a bit more about what's on your mind so I can provide the most relevant guidance?",
-                    "error": f"Primary: {str(e)}, Fallback: {str(fallback_error)}",
-                    "sentiment_analysis": {"primary_emotion": "neutral"},
-                    "follow_up_actions": ["general_career_exploration"]
-                }
+            logger.exception("Counseling error: %s", e)
+            # Answer from the canned replies rather than making a second LLM call
+            if sentiment_analysis is None:
+                sentiment_analysis = {"primary_emotion": EMOTION_NEUTRAL, "confidence_level": 0.5}
+            return {
+                "response": self._fallback_counseling_response(sentiment_analysis),
+                "sentiment_analysis": sentiment_analysis,
+                "follow_up_actions": ["general_career_exploration"],
+                "conversation_metadata": {"fallback_used": True}
+            }
     
-    async def _generate_counseling_response(
-        self,
-        message: str,
-        user_profile: Optional[UserProfile],
-        sentiment: Dict[str, Any],
-        context: Dict[str, Any],
-        conversation_history: List[Dict[str, str]]
-    ) -> str:
-        """Generate empathetic, contextually appropriate counseling response"""
-        
-        # Select appropriate response template
-        approach = context.get("suggested_approach", "collaborative_and_reflective")
-        template_key = self._map_approach_to_template(approach)
-        template = self.response_templates.get(template_key, self.response_templates["exploratory"])
-        
-        # Build context for LLM
-        system_prompt = self._build_counseling_system_prompt(sentiment, context, user_profile)
-        
-        # Include relevant knowledge base information
-        relevant_knowledge = self._get_relevant_knowledge(message, context)
-        
-        conversation_context = ""
-        if conversation_history:
-            recent_context = conversation_history[-3:]  # Last 3 exchanges
-            conversation_context = "\n".join([
-                f"{'User' if msg['role'] == 'user' else 'Counselor'}: {msg['content']}"
-                for msg in recent_context
-            ])
-        
-        user_info = ""
-        if user_profile:
-            user_info = f"""
-User Background:
-- Career Stage: {user_profile.career_stage or 'Not specified'}
-- Education: {user_profile.education_level or 'Not specified'}
-- Goals: {', '.join(user_profile.career_goals) if user_profile.career_goals else 'Not specified'}
-"""
-        
-        full_prompt = f"""{system_prompt}
-
-{user_info}
-
-Recent conversation context:
-{conversation_context}
-
-Relevant guidance from knowledge base:
-{relevant_knowledge}
-
-Current user message: {message}
-
-Emotional context: {sentiment.get('primary_emotion', 'neutral')} (confidence: {sentiment.get('confidence_level', 0):.2f})
-Conversation stage: {context.get('conversation_stage', 'ongoing')}
-
-Please provide a thoughtful, empathetic response that:
-1. Acknowledges the user's emotional state appropriately
-2. Provides practical, actionable guidance
-3. Maintains a supportive and professional tone
-4. Builds on previous conversation context
-5. Encourages continued engagement and growth
-
-Response template to consider: {template}"""
-
-        try:
-            response = await self.llm.ainvoke([{"role": "user", "content": full_prompt}])
-            return response.content
-            
-        except Exception as e:
-            # Fallback response
-            emotion = sentiment.get('primary_emotion', 'neutral')
-            if emotion == 'negative':
-                return f"{template['opening']} {template['encouragement']} What specific aspect would you like to focus on first?"
-            elif emotion == 'uncertain':
-                return f"{template['opening']} It's natural to feel uncertain about career decisions. What's the main question or concern on your mind right now?"
-            else:
-                return f"{template['opening']} {template['action']} What would be most helpful for you to explore next?"
+    async def process_counseling_batch(self, requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process several counseling requests concurrently. Each item holds the
+        keyword arguments of process_counseling_request; results keep input order
+        """
+        return await asyncio.gather(*(self.process_counseling_request(**request) for request in requests))
     
-    def _build_counseling_system_prompt(
+    async def stream_counseling_request(
         self,
-        sentiment: Dict[str, Any],
-        context: Dict[str, Any],
-        user_profile: Optional[UserProfile]
-    ) -> str:
-        base_prompt = """You are an expert career counselor with deep expertise in vocational psychology, career development theory, and emotional intelligence. Your role is to provide supportive, practical, and insightful career guidance.
-
-Key principles for your responses:
-1. Show empathy and emotional intelligence
-2. Provide concrete, actionable advice
-3. Draw from established career development theories
-4. Maintain appropriate professional boundaries
-5. Encourage self-reflection and growth
-6. Be realistic while remaining optimistic
-7. Adapt your communication style to the user's emotional state
-
-"""
-        
-        emotion = sentiment.get('primary_emotion', 'neutral')
-        if emotion == 'negative':
-            base_prompt += """
-The user appears to be experiencing some stress or negative emotions. Prioritize:
-- Validation and normalization of their feelings
-- Breaking down overwhelming situations into manageable steps
-- Providing reassurance while being honest about challenges
-- Offering immediate, small actions they can take
-"""
-        elif emotion == 'uncertain':
-            base_prompt += """
-The user seems uncertain or confused. Focus on:
-- Helping clarify their thoughts and priorities
-- Asking thoughtful questions to guide self-discovery
-- Providing frameworks for decision-making
-- Offering multiple perspectives or options
-"""
-        elif emotion == 'positive':
-            base_prompt += """
-The user appears motivated and positive. Leverage this by:
-- Building on their enthusiasm with specific action plans
-- Challenging them appropriately to grow
-- Helping them maintain momentum
-- Connecting their energy to concrete goals
-"""
-        
-        conversation_stage = context.get('conversation_stage', 'ongoing')
-        if conversation_stage == 'early_exploration':
-            base_prompt += """
-This is early in the conversation. Focus on:
-- Building rapport and trust
-- Understanding their background and goals
-- Asking open-ended questions
-- Setting a foundation for deeper exploration
-"""
-        
-        return base_prompt
-    
-    def _map_approach_to_template(self, approach: str) -> str:
-        mapping = {
-            "supportive_and_reassuring": "supportive",
-            "exploratory_and_engaging": "exploratory",
-            "practical_and_actionable": "practical",
-            "strategic_and_tactical": "practical",
-            "collaborative_and_reflective": "exploratory"
-        }
-        return mapping.get(approach, "exploratory")
-    
-    def _get_relevant_knowledge(self, message: str, context: Dict[str, Any]) -> str:
-        """Extract relevant knowledge base information based on message content"""
+        user_id: str,
+        message: str,
+        user_profile: Optional[UserProfile] = None,
+        conversation_history: Optional[List[ConversationMessage]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming variant of process_counseling_request. Yields {"delta": text}
+        events as the LLM produces tokens, then a final event with the analysis
+        """
         message_lower = message.lower()
-        relevant_info = []
-        
-        # Check for career change topics
-        if any(phrase in message_lower for phrase in ["career change", "switch careers", "new field", "transition"]):
-            career_change_info = self.knowledge_base["career_change"]
-            relevant_info.append(f"Career Change Considerations: {', '.join(career_change_info['key_considerations'][:3])}")
-        
-        # Check for skill development topics
-        if any(phrase in message_lower for phrase in ["skill", "learn", "course", "training", "development"]):
-            skill_info = self.knowledge_base["skill_development"]
-            relevant_info.append(f"Skill Development Strategies: {', '.join(skill_info['learning_strategies'][:3])}")
-        
-        # Check for job search topics
-        if any(phrase in message_lower for phrase in ["job search", "interview", "resume", "application", "hiring"]):
-            job_search_info = self.knowledge_base["job_search"]
-            relevant_info.append(f"Job Search Best Practices: {', '.join(job_search_info['modern_strategies'][:3])}")
-        
-        return "\n".join(relevant_info) if relevant_info else "General career development guidance available."
-    
-    def _suggest_follow_up_actions(
-        self,
-        sentiment: Dict[str, Any],
-        context: Dict[str, Any],
-        user_profile: Optional[UserProfile]
-    ) -> List[str]:
-        """Suggest appropriate follow-up actions based on conversation analysis"""
-        actions = []
-        
-        emotion = sentiment.get('primary_emotion', 'neutral')
-        stage = context.get('conversation_stage', 'ongoing')
-        topics = context.get('recent_topics', [])
-        
-        # Emotional state-based actions
-        if emotion == 'negative':
-            actions.extend([
-                "emotional_support_check_in",
-                "break_down_overwhelming_tasks",
-                "schedule_follow_up_conversation"
-            ])
-        elif emotion == 'uncertain':
-            actions.extend([
-                "clarifying_questions",
-                "decision_framework_guidance",
-                "exploration_exercises"
-            ])
-        elif emotion == 'positive':
-            actions.extend([
-                "action_plan_creation",
-                "goal_setting_session",
-                "momentum_building_tasks"
-            ])
-        
-        # Topic-based actions
-        if "career_exploration" in topics:
-            actions.append("personality_and_interest_assessment")
-        if "skill_development" in topics:
-            actions.append("learning_path_creation")
-        if "job_search" in topics:
-            actions.append("application_strategy_development")
-        
-        # Stage-based actions
-        if stage == "early_exploration":
-            actions.append("comprehensive_intake_session")
-        elif stage == "focused_discussion":
-            actions.append("deep_dive_analysis")
-        
-        # Profile-based actions
-        if user_profile and not user_profile.career_goals:
-            actions.append("goal_setting_workshop")
-        
-        return list(set(actions))  # Remove duplicates
-    
-    def _calculate_support_level(self, sentiment: Dict[str, Any]) -> float:
-        """Calculate how much emotional support is needed (0-1 scale)"""
-        emotion = sentiment.get('primary_emotion', 'neutral')
-        confidence = sentiment.get('confidence_level', 0.5)
+        sentiment_analysis = self._simple_sentiment_analysis(message, message_lower)
+        conversation_context = self._conversation_context(user_id, conversation_history)
+        messages = self._build_ai_counseling_messages(message, user_profile, sentiment_analysis, conversation_context)
+        cache_key = ResponseCache.key(user_id, messages)
+        cached_response = self._response_cache.get(cache_key)
+        
+        conversation_metadata = {
+            "response_type": "ai_generated",
+            "user_id": user_id,
+            "cache_hit": cached_response is not None
+        }
         
-        if emotion == 'negative':
-            return max(0.7, 1 - confidence)
-        elif emotion == 'uncertain':
-            return max(0.5, 1 - confidence)
-        elif emotion == 'positive':
-            return min(0.3, 1 - confidence)
+        if cached_response is not None:
+            yield {"delta": cached_response}
         else:
-            return 0.5
+            response_parts = []
+            # The LLM is read by a separate task so a slow SSE client does not hold a permit
+            chunks: asyncio.Queue = asyncio.Queue()
+            pump = asyncio.create_task(self._pump_llm_stream(messages, chunks))
+            try:
+                while (delta := await chunks.get()) is not _STREAM_END:
+                    if isinstance(delta, Exception):
+                        raise delta
+                    response_parts.append(delta)
+                    yield {"delta": delta}
+                # Only complete, non-empty replies are reused
+                full_response = "".join(response_parts).strip()
+                if full_response:
+                    self._response_cache.set(cache_key, full_response)
+            except Exception as e:
+                logger.exception("AI streaming error: %s", e)
+                if response_parts:
+                    # The reply stopped partway; mark it so it is not taken as a full answer
+                    conversation_metadata["truncated"] = True
+                else:
+                    conversation_metadata["fallback_used"] = True
+                    yield {"delta": self._fallback_counseling_response(sentiment_analysis)}
+            finally:
+                pump.cancel()
+        
+        yield {
+            "done": True,
+            "sentiment_analysis": sentiment_analysis,
+            "follow_up_actions": self._simple_follow_up_actions(message, message_lower),
+            "conversation_metadata": {**conversation_metadata, "timestamp": now_iso()}
+        }
     
-    def _calculate_information_density(self, context: Dict[str, Any]) -> float:
-        """Calculate how much information to provide (0-1 scale)"""
-        stage = context.get('conversation_stage', 'ongoing')
-        engagement = context.get('user_engagement_level', 0.5)
-        
-        if stage == 'early_exploration':
-            return min(0.6, engagement + 0.2)
-        elif stage == 'information_gathering':
-            return min(0.8, engagement + 0.3)
-        elif stage == 'focused_discussion':
-            return min(1.0, engagement + 0.4)
+    async def _pump_llm_stream(self, messages: List[Dict[str, str]], chunks: asyncio.Queue):
+        """Move streamed LLM text into an unbounded queue, holding an LLM permit only while reading;
+        ends with _STREAM_END, or with the exception that stopped the stream"""
+        try:
+            async with _get_llm_semaphore():
+                async for chunk in self.llm.astream(messages):
+                    delta = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                    if delta:
+                        chunks.put_nowait(delta)
+        except Exception as e:
+            chunks.put_nowait(e)
         else:
-            return engagement
+            chunks.put_nowait(_STREAM_END)
     
-    def _calculate_personalization_level(self, user_profile: Optional[UserProfile]) -> float:
-        """Calculate how personalized the response should be (0-1 scale)"""
-        if not user_profile:
-            return 0.2
-        
-        personalization_score = 0.2  # Base level
-        
-        if user_profile.personality:
-            personalization_score += 0.2
-        if user_profile.interests:
-            personalization_score += 0.2
-        if user_profile.career_goals:
-            personalization_score += 0.2
-        if user_profile.skills:
-            personalization_score += 0.2
-        
-        return min(1.0, personalization_score)
+    def _conversation_context(self, user_id: str, conversation_history: Optional[List[ConversationMessage]]) -> str:
+        """Render the recent-conversation prompt block, reusing it while the history window is unchanged"""
+        if not conversation_history:
+            return ""
+        
+        window = conversation_history[-5:]  # Last 5 messages
+        window_ids = tuple(msg.message_id for msg in window)
+        cached = self._history_cache.get(user_id)
+        if cached is not None and cached[0] == window_ids:
+            return cached[1]
+        
+        # Last 3 non-empty user messages of the window, rendered straight from the models
+        user_messages = [msg.user_message for msg in window if msg.user_message]
+        conversation_context = "\n".join(f"User: {text}" for text in user_messages[-3:])
+        
+        if user_id not in self._history_cache and len(self._history_cache) >= HISTORY_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            del self._history_cache[next(iter(self._history_cache))]
+        self._history_cache[user_id] = (window_ids, conversation_context)
+        return conversation_context
     
-    def _simple_sentiment_analysis(self, message: str) -> Dict[str, Any]:
+    def _simple_sentiment_analysis(self, message: str, message_lower: Optional[str] = None) -> Dict[str, Any]:
         """Simplified sentiment analysis without external tools"""
-        positive_words = ["excited", "happy", "motivated", "confident", "optimistic", "great", "good", "love", "enjoy"]
-        negative_words = ["worried", "anxious", "confused", "frustrated", "stressed", "difficult", "hate", "dislike", "fear"]
-        uncertainty_words = ["unsure", "confused", "maybe", "perhaps", "don't know", "uncertain", "doubt"]
-        
-        message_lower = message.lower()
-        
-        positive_count = sum(1 for word in positive_words if word in message_lower)
-        negative_count = sum(1 for word in negative_words if word in message_lower)
-        uncertainty_count = sum(1 for word in uncertainty_words if word in message_lower)
-        
-        total_words = len(message.split())
-        
-        # Calculate sentiment scores
-        sentiment_score = (positive_count - negative_count) / max(total_words * 0.1, 1)
-        confidence_score = max(0, 1 - (uncertainty_count / max(total_words * 0.1, 1)))
-        
-        # Determine primary emotion
-        if positive_count > negative_count and positive_count > uncertainty_count:
-            primary_emotion = "positive"
-        elif negative_count > positive_count and negative_count > uncertainty_count:
-            primary_emotion = "negative"
-        elif uncertainty_count > 0:
-            primary_emotion = "uncertain"
-        else:
-            primary_emotion = "neutral"
-        
-        return {
-            "sentiment_score": max(-1, min(1, sentiment_score)),
-            "confidence_level": max(0, min(1, confidence_score)),
-            "primary_emotion": primary_emotion,
-            "emotional_indicators": {
-                "positive_signals": positive_count,
-                "negative_signals": negative_count,
-                "uncertainty_signals": uncertainty_count
-            }
-        }
+        return analyze_sentiment(message, message_lower)
     
     async def _generate_ai_counseling_response(
         self, 
-        message: str, 
-        user_profile: Optional[UserProfile], 
+        messages: List[Dict[str, str]], 
         sentiment_analysis: Dict[str, Any], 
-        history_dict: List[Dict[str, str]]
+        cache_key: Optional[bytes] = None
     ) -> str:
         """Generate AI-powered counseling response using Google Gemini"""
-        
-        # Build user context
-        user_context = ""
-        if user_profile:
-            user_context = f"""
-User Background:
-- Career Stage: {user_profile.career_stage or 'Not specified'}
-- Education: {user_profile.education_level or 'Not specified'}
-- Age: {user_profile.age or 'Not specified'}
-- Location: {user_profile.location or 'Not specified'}
-"""
-        
-        # Build conversation history
-        conversation_context = ""
-        if history_dict:
-            recent_history = history_dict[-3:]  # Last 3 messages
-            conversation_context = "\n".join([
-                f"User: {msg['content']}" for msg in recent_history
-            ])
-        
-        # Build system prompt for career counseling
-        system_prompt = f"""You are an expert career counselor with deep expertise in vocational psychology and career development. 
-
-Your role is to provide empathetic, practical, and insightful career guidance. Always:
-1. Show empathy and understanding
-2. Provide concrete, actionable advice
-3. Ask thoughtful follow-up questions when appropriate
-4. Maintain a supportive and professional tone
-5. Be realistic while remaining encouraging
-
-{user_context}
-
-Recent conversation:
-{conversation_context}
-
-Current user emotional state: {sentiment_analysis.get('primary_emotion', 'neutral')}
-
-User's current message: {message}
-
-Please provide a thoughtful, empathetic response that acknowledges their situation and offers practical guidance. Keep your response conversational and supportive (2-4 sentences)."""
-
         try:
             # Call Google Gemini LLM
-            response = await self.llm.ainvoke([{"role": "user", "content": system_prompt}])
+            async with _get_llm_semaphore():
+                response = await self.llm.ainvoke(messages)
             ai_content = response.content if hasattr(response, 'content') else str(response)
-            return ai_content.strip()
+            ai_content = ai_content.strip()
+            # An empty reply (e.g. safety-blocked) is not worth replaying as a cache hit
+            if cache_key is not None and ai_content:
+                self._response_cache.set(cache_key, ai_content)
+            return ai_content
             
         except Exception as e:
-            print(f"AI response error: {str(e)}")
-            # Fallback response based on sentiment
-            emotion = sentiment_analysis.get('primary_emotion', 'neutral')
-            if emotion == 'negative':
-                return "I understand this situation can feel challenging. Career concerns are completely normal, and taking the time to think through your options shows great self-awareness. What specific aspect would you like to focus on first?"
-            elif emotion == 'uncertain':
-                return "It's natural to feel uncertain about career decisions - they're some of the most important choices we make. Let's explore your thoughts together. What's the main question on your mind right now?"
-            elif emotion == 'positive':
-                return "I love your enthusiasm! It's wonderful to see someone excited about their career journey. Let's channel that energy into creating a concrete plan. What's the first step you'd like to take?"
-            else:
-                return "Thank you for sharing that with me. Career development is an ongoing journey, and I'm here to support you. What would be most helpful for you to explore today?"
+            logger.exception("AI response error: %s", e)
+            return self._fallback_counseling_response(sentiment_analysis)
     
-    def _simple_follow_up_actions(self, message: str) -> List[str]:
+    def _build_ai_counseling_messages(
+        self,
+        message: str,
+        user_profile: Optional[UserProfile],
+        sentiment_analysis: Dict[str, Any],
+        conversation_context: str
+    ) -> List[Dict[str, str]]:
+        """Build the counseling messages shared by the buffered and streaming paths"""
+        # Build user context
+        user_context = ""
+        if user_profile:
+            user_context = _USER_BACKGROUND_TEMPLATE.format_map({
+                "career_stage": user_profile.career_stage or 'Not specified',
+                "education_level": user_profile.education_level or 'Not specified',
+                "age": user_profile.age or 'Not specified',
+                "location": user_profile.location or 'Not specified'
+            })
+        
+        return [
+            {"role": "system", "content": _AI_COUNSELING_SYSTEM_PROMPT},
+            {"role": "user", "content": _AI_COUNSELING_USER_TEMPLATE.format_map({
+                "user_context": user_context,
+                "conversation_context": conversation_context,
+                "emotion": sentiment_analysis.get('primary_emotion', EMOTION_NEUTRAL),
+                "message": message
+            })}
+        ]
+    
+    def _fallback_counseling_response(self, sentiment_analysis: Dict[str, Any]) -> str:
+        """Canned response based on sentiment for when the LLM is unavailable"""
+        emotion = sentiment_analysis.get('primary_emotion', EMOTION_NEUTRAL)
+        return _EMOTION_FALLBACKS.get(emotion, _EMOTION_FALLBACKS[EMOTION_NEUTRAL])
+    
+    def _simple_follow_up_actions(self, message: str, message_lower: Optional[str] = None) -> List[str]:
         """Generate simple follow-up actions based on message content"""
-        message_lower = message.lower()
-        actions = []
-        
-        # Career change related
-        if any(phrase in message_lower for phrase in ["career change", "switch careers", "new field", "transition"]):
-            actions.extend(["career_exploration", "transferable_skills_assessment", "industry_research"])
-        
-        # Skill development related
-        if any(phrase in message_lower for phrase in ["skill", "learn", "course", "training", "development"]):
-            actions.extend(["skills_assessment", "learning_plan_creation", "certification_guidance"])
+        if message_lower is None:
+            message_lower = message.lower()
         
-        # Job search related
-        if any(phrase in message_lower for phrase in ["job search", "interview", "resume", "application", "hiring"]):
-            actions.extend(["resume_review", "interview_preparation", "job_search_strategy"])
-        
-        # Goal setting related
-        if any(phrase in message_lower for phrase in ["goal", "plan", "future", "direction"]):
-            actions.extend(["goal_setting", "action_plan_creation", "milestone_planning"])
-        
-        # Emotional support related
-        if any(phrase in message_lower for phrase in ["worried", "anxious", "stressed", "confused", "frustrated"]):
-            actions.extend(["emotional_support", "stress_management", "confidence_building"])
+        # Each topic contributes three actions and only three are returned,
+        # so the first matching topic decides the result
+        for pattern, actions in _FOLLOW_UP_RULES:
+            if pattern.search(message_lower):
+                return list(actions)
         
         # Default actions if nothing specific detected
-        if not actions:
-            actions = ["general_career_exploration", "self_assessment", "goal_clarification"]
-        
-        return actions[:3]  # Return max 3 actions
-    
-    async def _generate_simple_ai_response(self, message: str) -> str:
-        """Generate a simple AI response for fallback scenarios"""
-        
-        simple_prompt = f"""You are a helpful career counselor. A user has asked: "{message}"
-
-Please provide a brief, supportive response that:
-1. Acknowledges their question or concern
-2. Offers encouragement
-3. Suggests a helpful next step
-
-Keep your response friendly and concise (1-2 sentences)."""
-
-        try:
-            response = await self.llm.ainvoke([{"role": "user", "content": simple_prompt}])
-            ai_content = response.content if hasattr(response, 'content') else str(response)
-            return ai_content.strip()
-            
-        except Exception as e:
-            print(f"Simple AI response error: {str(e)}")
-            return "I want to help you with your career concerns. Could you tell me a bit more about what's on your mind so I can provide the most relevant guidance?"
\ No newline at end of file
+        return list(_DEFAULT_FOLLOW_UP_ACTIONS)
@@ -1,18 +1,31 @@
 import os
 import asyncio
-from typing import List, Optional, Dict, Any
+import time
+import weakref
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from enum import Enum
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy import (
     Column, Integer, String, Float, DateTime, Text, JSON, Boolean,
-    ForeignKey, Table, create_engine, text
+    ForeignKey, Index, Table, create_engine, delete, event, text, insert, select, update
 )
 from sqlalchemy.orm import relationship
-from contextlib import asynccontextmanager
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from contextlib import asynccontextmanager, nullcontext
 import sqlite3
 import logging
+import orjson
 
 import sys
 from pathlib import Path
@@ -22,12 +35,121 @@ sys.path.insert(0, str(project_root))
 from core.data_models import (
     UserProfile, PersonalityAssessment, InterestAssessment,
     CareerRecommendation, SkillAssessmentResult, ProgressUpdate,
-    ConversationMessage, UserGoal
+    ConversationMessage, UserGoal, EducationLevel, CareerStage
 )
 
+logger = logging.getLogger(__name__)
+
+def make_json_serializable(obj: Any) -> Any:
+    """Convert a nested structure into JSON-safe values in a single pass"""
+    if isinstance(obj, dict):
+        return {k: make_json_serializable(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [make_json_serializable(item) for item in obj]
+    elif isinstance(obj, datetime):
+        return obj.isoformat()
+    elif obj is None or isinstance(obj, (str, int, float, bool)):
+        return obj
+    else:
+        return str(obj)  # Convert other objects to string representation
+
+
+def _enum_to_str(value: Any) -> Optional[str]:
+    """Column value for an enum field that may hold a member or (with use_enum_values) its value"""
+    if isinstance(value, Enum):
+        return value.value
+    return str(value) if value else None
+
+
+# Applied to every new SQLite connection: WAL lets readers run alongside the writer and
+# turns each commit into a log append instead of a full journal fsync
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+class utcnow(FunctionElement):
+    """Current UTC time computed by the database, for column defaults and onupdate"""
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP is UTC on SQLite but only to the second
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    # now() is in the session time zone; columns are naive UTC timestamps
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+# JSON on SQLite; binary, indexable JSONB on PostgreSQL
+JSONType = JSON().with_variant(JSONB, "postgresql")
+
+# Serialized JSON at least this large is stored zlib-compressed by CompressedJSON
+COMPRESSED_JSON_MIN_BYTES = 512
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON kept as text, or as zlib-compressed bytes once it reaches COMPRESSED_JSON_MIN_BYTES.
+    
+    Reads accept either form, so rows written by the plain JSON column stay readable.
+    """
+    impl = Text
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        data = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        if len(data) >= COMPRESSED_JSON_MIN_BYTES:
+            return zlib.compress(data)
+        return data.decode()
+    
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, (bytes, memoryview)):
+            return orjson.loads(zlib.decompress(value))
+        return orjson.loads(value)
+
+
+# Large, rarely-queried JSON blobs: compressed on SQLite, whose dynamic typing lets bytes sit in a
+# TEXT column; left to TOAST compression on PostgreSQL and plain JSON everywhere else
+CompressedJSONType = JSON().with_variant(CompressedJSON(), "sqlite").with_variant(JSONB, "postgresql")
+
 # Database Models
 Base = declarative_base()
 
+
+def _create_missing_indexes(sync_conn):
+    """create_all skips indexes on tables that already exist, so create those individually"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
 # Association tables for many-to-many relationships
 user_skills_table = Table(
     'user_skills',
@@ -57,33 +179,39 @@ class User(Base):
     
     # Onboarding and personalization
     questionnaire_completed = Column(Boolean, default=False)
-    questionnaire_responses = Column(JSON)
-    personality_insights = Column(JSON)
-    interest_insights = Column(JSON)
+    questionnaire_responses = Column(CompressedJSONType)
+    personality_insights = Column(JSONType)
+    interest_insights = Column(JSONType)
     
     # JSON fields for flexible data
-    career_goals = Column(JSON)
-    values = Column(JSON)
-    preferred_work_environment = Column(JSON)
-    
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    # Relationships
-    personality_assessments = relationship("PersonalityAssessmentDB", back_populates="user")
-    interest_assessments = relationship("InterestAssessmentDB", back_populates="user")
-    skill_assessments = relationship("SkillAssessmentDB", back_populates="user")
-    career_recommendations = relationship("CareerRecommendationDB", back_populates="user")
-    conversations = relationship("ConversationDB", back_populates="user")
-    progress_updates = relationship("ProgressUpdateDB", back_populates="user")
-    goals = relationship("UserGoalDB", back_populates="user")
+    career_goals = Column(JSONType)
+    values = Column(JSONType)
+    preferred_work_environment = Column(JSONType)
+    
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
+    
+    # GIN index for containment lookups (career_goals @> '["..."]'); PostgreSQL only
+    __table_args__ = (
+        Index('ix_users_career_goals', 'career_goals', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+    
+    # Relationships never load implicitly (async sessions cannot lazy-load anyway);
+    # queries that need children must ask for them with selectinload()
+    personality_assessments = relationship("PersonalityAssessmentDB", back_populates="user", lazy="raise")
+    interest_assessments = relationship("InterestAssessmentDB", back_populates="user", lazy="raise")
+    skill_assessments = relationship("SkillAssessmentDB", back_populates="user", lazy="raise")
+    career_recommendations = relationship("CareerRecommendationDB", back_populates="user", lazy="raise")
+    conversations = relationship("ConversationDB", back_populates="user", lazy="raise")
+    progress_updates = relationship("ProgressUpdateDB", back_populates="user", lazy="raise")
+    goals = relationship("UserGoalDB", back_populates="user", lazy="raise")
 
 
 class PersonalityAssessmentDB(Base):
     __tablename__ = 'personality_assessments'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(String, ForeignKey('users.user_id'), nullable=False)
+    user_id = Column(String, ForeignKey('users.user_id'), nullable=False, index=True)
     
     openness = Column(Float, nullable=False)
     conscientiousness = Column(Float, nullable=False)
@@ -93,14 +221,14 @@ class PersonalityAssessmentDB(Base):
     
     assessment_date = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="personality_assessments")
+    user = relationship("User", back_populates="personality_assessments", lazy="raise")
 
 
 class InterestAssessmentDB(Base):
     __tablename__ = 'interest_assessments'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(String, ForeignKey('users.user_id'), nullable=False)
+    user_id = Column(String, ForeignKey('users.user_id'), nullable=False, index=True)
     
     realistic = Column(Float, nullable=False)
     investigative = Column(Float, nullable=False)
@@ -111,7 +239,7 @@ class InterestAssessmentDB(Base):
     
     assessment_date = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="interest_assessments")
+    user = relationship("User", back_populates="interest_assessments", lazy="raise")
 
 
 class Skill(Base):
@@ -122,27 +250,27 @@ class Skill(Base):
     category = Column(String, nullable=False)
     description = Column(Text)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
 
 
 class SkillAssessmentDB(Base):
     __tablename__ = 'skill_assessments'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(String, ForeignKey('users.user_id'), nullable=False)
+    user_id = Column(String, ForeignKey('users.user_id'), nullable=False, index=True)
     skill_name = Column(String, nullable=False)
     
     assessed_level = Column(String, nullable=False)
     confidence_score = Column(Float, nullable=False)
     
-    strengths = Column(JSON)
-    improvement_areas = Column(JSON)
-    recommendations = Column(JSON)
+    strengths = Column(JSONType)
+    improvement_areas = Column(JSONType)
+    recommendations = Column(JSONType)
     
     assessment_method = Column(String)
     assessment_date = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="skill_assessments")
+    user = relationship("User", back_populates="skill_assessments", lazy="raise")
 
 
 class CareerRecommendationDB(Base):
@@ -156,20 +284,25 @@ class CareerRecommendationDB(Base):
     industry = Column(String, nullable=False)
     match_score = Column(Float, nullable=False)
     
-    required_skills = Column(JSON)
-    preferred_skills = Column(JSON)
-    education_requirements = Column(JSON)
+    required_skills = Column(JSONType)
+    preferred_skills = Column(JSONType)
+    education_requirements = Column(JSONType)
     
-    salary_range = Column(JSON)
+    salary_range = Column(JSONType)
     growth_outlook = Column(String)
-    work_environment = Column(JSON)
+    work_environment = Column(JSONType)
     
     reasoning = Column(Text)
-    recommended_actions = Column(JSON)
+    recommended_actions = Column(JSONType)
+    
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    user = relationship("User", back_populates="career_recommendations", lazy="raise")
     
-    user = relationship("User", back_populates="career_recommendations")
+    # Leading user_id also serves plain per-user lookups
+    __table_args__ = (
+        Index('ix_career_rec_user_created', 'user_id', 'created_at'),
+    )
 
 
 class ConversationDB(Base):
@@ -183,15 +316,50 @@ class ConversationDB(Base):
     user_message = Column(Text, nullable=False)
     agent_response = Column(Text, nullable=False)
     
-    context = Column(JSON)
-    conversation_metadata = Column(JSON)
+    context = Column(JSONType)
+    conversation_metadata = Column(CompressedJSONType)
     
     confidence = Column(Float, default=0.0)
     processing_time_ms = Column(Integer)
     
     timestamp = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="conversations")
+    user = relationship("User", back_populates="conversations", lazy="raise")
+    
+    # Serves get_conversation_history (user_id filter, newest first) straight from the index
+    __table_args__ = (
+        Index('ix_conv_user_ts', 'user_id', timestamp.desc()),
+    )
+
+
+class ConversationArchiveDB(Base):
+    """Conversations moved out of the hot table by archive_conversations, same columns"""
+    __tablename__ = 'conversations_archive'
+    
+    id = Column(Integer, primary_key=True)
+    message_id = Column(String, unique=True, nullable=False)
+    user_id = Column(String, nullable=False, index=True)
+    agent_name = Column(String, nullable=False)
+    
+    user_message = Column(Text, nullable=False)
+    agent_response = Column(Text, nullable=False)
+    
+    context = Column(JSONType)
+    conversation_metadata = Column(CompressedJSONType)
+    
+    confidence = Column(Float, default=0.0)
+    processing_time_ms = Column(Integer)
+    
+    timestamp = Column(DateTime)
+
+
+# Conversation columns every history read needs, and the JSON blobs only some callers use
+CONVERSATION_SUMMARY_COLUMNS = (
+    ConversationDB.message_id, ConversationDB.user_id, ConversationDB.agent_name,
+    ConversationDB.user_message, ConversationDB.agent_response,
+    ConversationDB.confidence, ConversationDB.processing_time_ms, ConversationDB.timestamp
+)
+CONVERSATION_DETAIL_COLUMNS = (ConversationDB.context, ConversationDB.conversation_metadata)
 
 
 class ProgressUpdateDB(Base):
@@ -203,24 +371,28 @@ class ProgressUpdateDB(Base):
     goal_name = Column(String)
     
     progress_percentage = Column(Float, nullable=False)
-    milestones_completed = Column(JSON)
-    current_activities = Column(JSON)
+    milestones_completed = Column(JSONType)
+    current_activities = Column(JSONType)
     
-    achievements = Column(JSON)
-    challenges = Column(JSON)
-    next_steps = Column(JSON)
+    achievements = Column(JSONType)
+    challenges = Column(JSONType)
+    next_steps = Column(JSONType)
     
     notes = Column(Text)
     date_recorded = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="progress_updates")
+    user = relationship("User", back_populates="progress_updates", lazy="raise")
+    
+    __table_args__ = (
+        Index('ix_progress_user_recorded', 'user_id', 'date_recorded'),
+    )
 
 
 class UserGoalDB(Base):
     __tablename__ = 'user_goals'
     
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(String, ForeignKey('users.user_id'), nullable=False)
+    user_id = Column(String, ForeignKey('users.user_id'), nullable=False, index=True)
     
     title = Column(String, nullable=False)
     description = Column(Text)
@@ -229,16 +401,16 @@ class UserGoalDB(Base):
     target_date = Column(DateTime)
     priority = Column(Integer, default=5)
     
-    milestones = Column(JSON)
-    success_metrics = Column(JSON)
+    milestones = Column(JSONType)
+    success_metrics = Column(JSONType)
     
     status = Column(String, default='active')
     progress_percentage = Column(Float, default=0.0)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    updated_at = Column(DateTime, default=utcnow(), server_default=utcnow(), onupdate=utcnow())
     
-    user = relationship("User", back_populates="goals")
+    user = relationship("User", back_populates="goals", lazy="raise")
 
 
 class IndustryTrendDB(Base):
@@ -252,14 +424,50 @@ class IndustryTrendDB(Base):
     impact_level = Column(String, nullable=False)
     time_horizon = Column(String, nullable=False)
     
-    affected_roles = Column(JSON)
-    emerging_skills = Column(JSON)
-    declining_skills = Column(JSON)
+    affected_roles = Column(JSONType)
+    emerging_skills = Column(JSONType)
+    declining_skills = Column(JSONType)
     
     source = Column(String, nullable=False)
     confidence = Column(Float, nullable=False)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=utcnow(), server_default=utcnow())
+    
+    # GIN index for "trends affecting role X" containment lookups; PostgreSQL only
+    __table_args__ = (
+        Index('ix_industry_trends_affected_roles', 'affected_roles', postgresql_using='gin').ddl_if(dialect='postgresql'),
+    )
+
+
+# Compiled-SQL cache entries per engine (SQLAlchemy default 500), sized so the repository's
+# fixed statements plus their per-dialect/per-parameter-shape variants never get evicted
+QUERY_CACHE_SIZE = 1200
+
+# asyncpg prepared statements kept per connection (driver default 100)
+ASYNCPG_STATEMENT_CACHE_SIZE = 500
+
+# Connection pool per worker for server databases (SQLAlchemy default 5 + 10 overflow).
+# SQLite keeps the dialect defaults: a queue pool of open connections for files, which
+# WAL lets read concurrently, and a single static connection for :memory:
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+# Common skills seeded into the reference table on startup
+INITIAL_SKILLS = [
+    {"name": "Python", "category": "Technical"},
+    {"name": "Machine Learning", "category": "Technical"},
+    {"name": "Data Analysis", "category": "Technical"},
+    {"name": "Communication", "category": "Soft"},
+    {"name": "Leadership", "category": "Soft"},
+    {"name": "Project Management", "category": "Business"},
+    {"name": "JavaScript", "category": "Technical"},
+    {"name": "SQL", "category": "Technical"},
+    {"name": "Problem Solving", "category": "Soft"},
+    {"name": "Digital Marketing", "category": "Business"}
+]
+
+# Dialect insert constructs that support ON CONFLICT DO NOTHING
+ON_CONFLICT_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
 
 
 class DatabaseManager:
@@ -276,10 +484,23 @@ class DatabaseManager:
             if self.database_url.startswith("sqlite"):
                 # For SQLite, use aiosqlite
                 sqlite_url = self.database_url.replace("sqlite://", "sqlite+aiosqlite://")
-                self.engine = create_async_engine(sqlite_url, echo=False)
+                self.engine = create_async_engine(sqlite_url, echo=False, query_cache_size=QUERY_CACHE_SIZE)
+                event.listen(self.engine.sync_engine, "connect", _apply_sqlite_pragmas)
             else:
                 # For PostgreSQL and other databases
-                self.engine = create_async_engine(self.database_url, echo=False)
+                connect_args = {}
+                if self.database_url.startswith("postgresql+asyncpg"):
+                    # Keep every repository statement prepared server-side on each connection
+                    connect_args["prepared_statement_cache_size"] = ASYNCPG_STATEMENT_CACHE_SIZE
+                self.engine = create_async_engine(
+                    self.database_url, echo=False,
+                    query_cache_size=QUERY_CACHE_SIZE, connect_args=connect_args,
+                    pool_size=DB_POOL_SIZE,
+                    max_overflow=DB_MAX_OVERFLOW,
+                    pool_timeout=5,
+                    pool_recycle=1800,
+                    pool_pre_ping=True
+                )
             
             # Create session factory
             self.async_session_factory = sessionmaker(
@@ -288,9 +509,10 @@ class DatabaseManager:
                 expire_on_commit=False
             )
             
-            # Create all tables
+            # Create all tables, then any indexes added since an existing database was created
             async with self.engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                await conn.run_sync(_create_missing_indexes)
             
             self.logger.info("Database initialized successfully")
             
@@ -305,36 +527,35 @@ class DatabaseManager:
         """Populate database with initial reference data"""
         async with self.get_session() as session:
             try:
-                # Check if skills already exist
-                result = await session.execute(text("SELECT COUNT(*) FROM skills"))
-                count = result.scalar()
+                dialect_insert = ON_CONFLICT_INSERTS.get(self.engine.dialect.name)
+                if dialect_insert is not None:
+                    # One idempotent statement: skills already present are skipped by name
+                    result = await session.execute(
+                        dialect_insert(Skill).values(INITIAL_SKILLS).on_conflict_do_nothing(index_elements=["name"])
+                    )
+                    populated = bool(result.rowcount)
+                else:
+                    # No ON CONFLICT support, so only seed an empty table
+                    count = await session.scalar(text("SELECT COUNT(*) FROM skills"))
+                    populated = count == 0
+                    if populated:
+                        await session.execute(insert(Skill), INITIAL_SKILLS)
+                await session.commit()
                 
-                if count == 0:
-                    # Add common skills
-                    skills_data = [
-                        {"name": "Python", "category": "Technical"},
-                        {"name": "Machine Learning", "category": "Technical"},
-                        {"name": "Data Analysis", "category": "Technical"},
-                        {"name": "Communication", "category": "Soft"},
-                        {"name": "Leadership", "category": "Soft"},
-                        {"name": "Project Management", "category": "Business"},
-                        {"name": "JavaScript", "category": "Technical"},
-                        {"name": "SQL", "category": "Technical"},
-                        {"name": "Problem Solving", "category": "Soft"},
-                        {"name": "Digital Marketing", "category": "Business"}
-                    ]
-                    
-                    for skill_data in skills_data:
-                        skill = Skill(**skill_data)
-                        session.add(skill)
-                    
-                    await session.commit()
+                if populated:
                     self.logger.info("Initial skills data populated")
                     
             except Exception as e:
                 self.logger.error(f"Error populating initial data: {str(e)}")
                 await session.rollback()
     
+    @asynccontextmanager
+    async def transaction(self):
+        """Session whose writes are committed once, when the block exits without error"""
+        async with self.get_session() as session:
+            yield session
+            await session.commit()
+    
     @asynccontextmanager
     async def get_session(self):
         """Get async database session with automatic cleanup"""
@@ -354,11 +575,84 @@ class DatabaseManager:
             self.logger.info("Database connection closed")
 
 
+@dataclass
+class CachedProfile:
+    """A cached UserProfile together with its dict form, serialized once per cache fill"""
+    profile: UserProfile
+    serialized: Dict[str, Any]
+
+
+class ProfileCache:
+    """In-process TTL + LRU cache for UserProfile lookups keyed by user_id"""
+    
+    def __init__(self, maxsize: int = 10_000, ttl_seconds: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, CachedProfile]]" = OrderedDict()
+        # Per-user invalidation stamps drawn from one counter, so a stamp never repeats;
+        # users evicted from this map fall back to the newest evicted stamp
+        self._generations: "OrderedDict[str, int]" = OrderedDict()
+        self._generation_counter = 0
+        self._generation_floor = 0
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+    
+    def get(self, user_id: str) -> Optional[CachedProfile]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        
+        expires_at, cached = entry
+        if expires_at < time.monotonic():
+            del self._entries[user_id]
+            return None
+        
+        self._entries.move_to_end(user_id)
+        return cached
+    
+    def set(self, user_id: str, profile: UserProfile, generation: Optional[int] = None) -> CachedProfile:
+        """Cache a profile; skip storing it if the user was invalidated since `generation` was read"""
+        cached = CachedProfile(profile=profile, serialized=profile.model_dump(mode="json"))
+        if generation is not None and generation != self.generation(user_id):
+            return cached
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, cached)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return cached
+    
+    def generation(self, user_id: str) -> int:
+        """Stamp of the user's last invalidation; read before a fetch and pass it to set()"""
+        return self._generations.get(user_id, self._generation_floor)
+    
+    def invalidate(self, user_id: str):
+        self._entries.pop(user_id, None)
+        self._generation_counter += 1
+        self._generations[user_id] = self._generation_counter
+        self._generations.move_to_end(user_id)
+        while len(self._generations) > self.maxsize:
+            _, evicted = self._generations.popitem(last=False)
+            self._generation_floor = max(self._generation_floor, evicted)
+    
+    def clear(self):
+        self._entries.clear()
+        self._generation_counter += 1
+        self._generations.clear()
+        self._generation_floor = self._generation_counter
+    
+    def lock_for(self, user_id: str) -> asyncio.Lock:
+        """Per-user lock so concurrent misses for the same user share one DB read"""
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[user_id] = lock
+        return lock
+
+
 class UserRepository:
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
         
-    async def create_user(self, user_profile: UserProfile) -> str:
+    async def create_user(self, user_profile: UserProfile, session: Optional[AsyncSession] = None) -> str:
         """Create a new user in the database"""
         import logging
         logger = logging.getLogger(__name__)
@@ -366,39 +660,23 @@ class UserRepository:
         logger.info(f"Education level type: {type(user_profile.education_level)}")
         logger.info(f"Career stage type: {type(user_profile.career_stage)}")
         
-        async with self.db_manager.get_session() as session:
+        async with self._write_session(session) as session:
             try:
-                # Handle enum to string conversion safely
-                education_level_str = None
-                if user_profile.education_level:
-                    if hasattr(user_profile.education_level, 'value'):
-                        education_level_str = user_profile.education_level.value
-                    else:
-                        education_level_str = str(user_profile.education_level)
-                
-                career_stage_str = None
-                if user_profile.career_stage:
-                    if hasattr(user_profile.career_stage, 'value'):
-                        career_stage_str = user_profile.career_stage.value
-                    else:
-                        career_stage_str = str(user_profile.career_stage)
-                
                 db_user = User(
                     user_id=user_profile.user_id,
                     name=user_profile.name,
                     email=user_profile.email,
                     age=user_profile.age,
                     location=user_profile.location,
-                    education_level=education_level_str,
-                    career_stage=career_stage_str,
+                    education_level=_enum_to_str(user_profile.education_level),
+                    career_stage=_enum_to_str(user_profile.career_stage),
                     career_goals=user_profile.career_goals,
                     values=user_profile.values,
                     preferred_work_environment=user_profile.preferred_work_environment
                 )
                 
                 session.add(db_user)
-                await session.commit()
-                
+                self._invalidate_on_commit(session, user_profile.user_id)
                 return user_profile.user_id
                 
             except Exception as e:
@@ -406,7 +684,58 @@ class UserRepository:
                 raise e
     
     async def get_user(self, user_id: str) -> Optional[UserProfile]:
-        """Get user profile by ID"""
+        """Get user profile by ID, served from the profile cache when fresh"""
+        cached = await self.get_user_cached(user_id)
+        return cached.profile if cached else None
+    
+    async def get_user_cached(self, user_id: str) -> Optional[CachedProfile]:
+        """Get the cached profile entry (profile plus its serialized dict) for a user"""
+        cached = profile_cache.get(user_id)
+        if cached is not None:
+            return cached
+        
+        async with profile_cache.lock_for(user_id):
+            cached = profile_cache.get(user_id)
+            if cached is not None:
+                return cached
+            
+            # A write that commits while the fetch is in flight bumps the generation,
+            # so the row read here is not cached over the newer one
+            generation = profile_cache.generation(user_id)
+            user_profile = await self._fetch_user(user_id)
+            if user_profile:
+                return profile_cache.set(user_id, user_profile, generation)
+            return None
+    
+    def invalidate_user(self, user_id: str):
+        """Drop a user's cached profile so the next read goes to the database"""
+        profile_cache.invalidate(user_id)
+    
+    def _invalidate_on_commit(self, session: AsyncSession, user_id: str):
+        """Drop the cached profile once the session's transaction actually commits"""
+        event.listen(
+            session.sync_session, "after_commit",
+            lambda _session: profile_cache.invalidate(user_id), once=True
+        )
+    
+    async def _update_user_columns(self, session: AsyncSession, user_id: str, **values) -> bool:
+        """Write columns with one UPDATE instead of loading the row first; False if no such user"""
+        result = await session.execute(
+            update(User)
+            .where(User.user_id == user_id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+    
+    def _write_session(self, session: Optional[AsyncSession]):
+        """Use the caller's session as-is (the caller commits), or open one committed on exit"""
+        if session is not None:
+            return nullcontext(session)
+        return self.db_manager.transaction()
+    
+    async def _fetch_user(self, user_id: str) -> Optional[UserProfile]:
+        """Load user profile from the database"""
         async with self.db_manager.get_session() as session:
             try:
                 result = await session.get(User, user_id)
@@ -416,51 +745,37 @@ class UserRepository:
             except Exception as e:
                 raise e
     
-    async def update_user(self, user_profile: UserProfile) -> bool:
+    async def update_user(self, user_profile: UserProfile, session: Optional[AsyncSession] = None) -> bool:
         """Update existing user profile"""
-        async with self.db_manager.get_session() as session:
+        async with self._write_session(session) as session:
             try:
-                db_user = await session.get(User, user_profile.user_id)
-                if not db_user:
+                updated = await self._update_user_columns(
+                    session, user_profile.user_id,
+                    name=user_profile.name,
+                    email=user_profile.email,
+                    age=user_profile.age,
+                    location=user_profile.location,
+                    education_level=_enum_to_str(user_profile.education_level),
+                    career_stage=_enum_to_str(user_profile.career_stage),
+                    career_goals=user_profile.career_goals,
+                    values=user_profile.values,
+                    preferred_work_environment=user_profile.preferred_work_environment
+                )
+                if not updated:
                     return False
                 
-                # Update fields
-                db_user.name = user_profile.name
-                db_user.email = user_profile.email
-                db_user.age = user_profile.age
-                db_user.location = user_profile.location
-                
-                # Handle enum to string conversion safely
-                if user_profile.education_level:
-                    if hasattr(user_profile.education_level, 'value'):
-                        db_user.education_level = user_profile.education_level.value
-                    else:
-                        db_user.education_level = str(user_profile.education_level)
-                else:
-                    db_user.education_level = None
-                    
-                if user_profile.career_stage:
-                    if hasattr(user_profile.career_stage, 'value'):
-                        db_user.career_stage = user_profile.career_stage.value
-                    else:
-                        db_user.career_stage = str(user_profile.career_stage)
-                else:
-                    db_user.career_stage = None
-                db_user.career_goals = user_profile.career_goals
-                db_user.values = user_profile.values
-                db_user.preferred_work_environment = user_profile.preferred_work_environment
-                db_user.updated_at = datetime.utcnow()
-                
-                await session.commit()
+                self._invalidate_on_commit(session, user_profile.user_id)
                 return True
                 
             except Exception as e:
                 await session.rollback()
                 raise e
     
-    async def save_personality_assessment(self, user_id: str, assessment: PersonalityAssessment):
+    async def save_personality_assessment(
+        self, user_id: str, assessment: PersonalityAssessment, session: Optional[AsyncSession] = None
+    ):
         """Save personality assessment results"""
-        async with self.db_manager.get_session() as session:
+        async with self._write_session(session) as session:
             try:
                 db_assessment = PersonalityAssessmentDB(
                     user_id=user_id,
@@ -473,15 +788,16 @@ class UserRepository:
                 )
                 
                 session.add(db_assessment)
-                await session.commit()
                 
             except Exception as e:
                 await session.rollback()
                 raise e
     
-    async def save_interest_assessment(self, user_id: str, assessment: InterestAssessment):
+    async def save_interest_assessment(
+        self, user_id: str, assessment: InterestAssessment, session: Optional[AsyncSession] = None
+    ):
         """Save interest assessment results"""
-        async with self.db_manager.get_session() as session:
+        async with self._write_session(session) as session:
             try:
                 db_assessment = InterestAssessmentDB(
                     user_id=user_id,
@@ -495,94 +811,177 @@ class UserRepository:
                 )
                 
                 session.add(db_assessment)
-                await session.commit()
                 
             except Exception as e:
                 await session.rollback()
                 raise e
     
-    async def save_career_recommendations(self, user_id: str, recommendations: List[CareerRecommendation]):
-        """Save career recommendations"""
-        async with self.db_manager.get_session() as session:
+    async def save_career_recommendations(
+        self, user_id: str, recommendations: List[CareerRecommendation], session: Optional[AsyncSession] = None
+    ):
+        """Save career recommendations with a single multi-row insert"""
+        if not recommendations:
+            return
+        
+        async with self._write_session(session) as session:
             try:
-                for rec in recommendations:
-                    db_rec = CareerRecommendationDB(
-                        user_id=user_id,
-                        title=rec.title,
-                        description=rec.description,
-                        industry=rec.industry,
-                        match_score=rec.match_score,
-                        required_skills=rec.required_skills,
-                        preferred_skills=rec.preferred_skills,
-                        education_requirements=rec.education_requirements,
-                        salary_range=rec.salary_range,
-                        growth_outlook=rec.growth_outlook,
-                        work_environment=rec.work_environment,
-                        reasoning=rec.reasoning,
-                        recommended_actions=rec.recommended_actions
-                    )
-                    
-                    session.add(db_rec)
-                
-                await session.commit()
+                await session.execute(
+                    insert(CareerRecommendationDB),
+                    [self._recommendation_to_row(user_id, rec) for rec in recommendations]
+                )
                 
             except Exception as e:
                 await session.rollback()
                 raise e
     
-    async def save_conversation(self, message: ConversationMessage):
+    def _recommendation_to_row(self, user_id: str, rec: CareerRecommendation) -> Dict[str, Any]:
+        """Map a CareerRecommendation onto CareerRecommendationDB column values"""
+        return {
+            "user_id": user_id,
+            "title": rec.title,
+            "description": rec.description,
+            "industry": rec.industry,
+            "match_score": rec.match_score,
+            "required_skills": rec.required_skills,
+            "preferred_skills": rec.preferred_skills,
+            "education_requirements": rec.education_requirements,
+            "salary_range": rec.salary_range,
+            "growth_outlook": rec.growth_outlook,
+            "work_environment": rec.work_environment,
+            "reasoning": rec.reasoning,
+            "recommended_actions": rec.recommended_actions
+        }
+    
+    async def save_conversation(self, message: ConversationMessage, session: Optional[AsyncSession] = None):
         """Save conversation message"""
-        async with self.db_manager.get_session() as session:
+        async with self._write_session(session) as session:
             try:
-                db_message = ConversationDB(
-                    message_id=message.message_id,
-                    user_id=message.user_id,
-                    agent_name=message.agent_name,
-                    user_message=message.user_message,
-                    agent_response=message.agent_response,
-                    context=message.context,
-                    conversation_metadata=message.metadata,
-                    confidence=message.confidence,
-                    processing_time_ms=message.processing_time_ms,
-                    timestamp=message.timestamp
-                )
+                db_message = ConversationDB(**self._conversation_to_row(message))
                 
                 session.add(db_message)
-                await session.commit()
                 
             except Exception as e:
                 await session.rollback()
                 raise e
     
-    async def get_conversation_history(self, user_id: str, limit: int = 50) -> List[ConversationMessage]:
-        """Get conversation history for user"""
+    async def save_conversations_bulk(self, messages: List[ConversationMessage], session: Optional[AsyncSession] = None) -> int:
+        """Save a batch of conversation messages with a single multi-row insert; returns rows saved.
+        
+        Without a caller session, a failed batch is retried one row per transaction so a single
+        bad row (e.g. an unknown user_id) only drops itself, not the rest of the batch.
+        """
+        if not messages:
+            return 0
+        
+        rows = [self._conversation_to_row(message) for message in messages]
+        if session is not None:
+            try:
+                await session.execute(insert(ConversationDB), rows)
+                return len(rows)
+            except Exception as e:
+                await session.rollback()
+                raise e
+        
+        try:
+            async with self.db_manager.transaction() as session:
+                await session.execute(insert(ConversationDB), rows)
+            return len(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                raise
+            logger.warning("Batch insert of %s conversations failed, retrying one by one: %s", len(rows), e)
+        
+        saved = 0
+        for row in rows:
+            try:
+                async with self.db_manager.transaction() as session:
+                    await session.execute(insert(ConversationDB), [row])
+                saved += 1
+            except Exception as e:
+                logger.error("Dropping conversation %s for user %s: %s", row["message_id"], row["user_id"], e)
+        return saved
+    
+    def _conversation_to_row(self, message: ConversationMessage) -> Dict[str, Any]:
+        """Map a ConversationMessage onto ConversationDB column values"""
+        return {
+            "message_id": message.message_id,
+            "user_id": message.user_id,
+            "agent_name": message.agent_name,
+            "user_message": message.user_message,
+            "agent_response": message.agent_response,
+            "context": message.context,
+            "conversation_metadata": message.metadata,
+            "confidence": message.confidence,
+            "processing_time_ms": message.processing_time_ms,
+            "timestamp": message.timestamp
+        }
+    
+    async def get_conversation_history(
+        self,
+        user_id: str,
+        limit: int = 50,
+        before: Optional[datetime] = None,
+        include_details: bool = True
+    ) -> List[ConversationMessage]:
+        """Get conversation history for user, newest first.
+        
+        Pass the oldest timestamp of a page as `before` to fetch the next one. With
+        include_details=False the JSON context/metadata columns are not read.
+        """
+        columns = CONVERSATION_SUMMARY_COLUMNS + (CONVERSATION_DETAIL_COLUMNS if include_details else ())
+        
         async with self.db_manager.get_session() as session:
             try:
-                from sqlalchemy import select
-                query = select(ConversationDB).where(
+                # Plain column rows skip ORM identity-map bookkeeping
+                query = select(*columns).where(
                     ConversationDB.user_id == user_id
                 ).order_by(ConversationDB.timestamp.desc()).limit(limit)
                 
+                # Keyset pagination: stays an index range scan however deep the page
+                if before is not None:
+                    query = query.where(ConversationDB.timestamp < before)
+                
                 result = await session.execute(query)
-                conversations = result.scalars().all()
                 
-                return [self._db_conversation_to_message(conv) for conv in conversations]
+                return [self._db_conversation_to_message(row) for row in result]
                 
             except Exception as e:
                 raise e
     
+    async def archive_conversations(self, older_than: datetime, session: Optional[AsyncSession] = None) -> int:
+        """Move conversations older than the cutoff into conversations_archive; returns rows moved"""
+        # The hot table's rowid-style ids are reused once its newest rows move out, so the
+        # archive assigns its own keys rather than copying them
+        columns = [column for column in ConversationDB.__table__.columns if column.name != "id"]
+        stale = ConversationDB.timestamp < older_than
+        
+        async with self._write_session(session) as session:
+            try:
+                await session.execute(
+                    insert(ConversationArchiveDB).from_select(
+                        [column.name for column in columns], select(*columns).where(stale)
+                    )
+                )
+                result = await session.execute(
+                    delete(ConversationDB).where(stale).execution_options(synchronize_session=False)
+                )
+                return result.rowcount
+                
+            except Exception as e:
+                await session.rollback()
+                raise e
+    
     def _db_user_to_profile(self, db_user: User) -> UserProfile:
         """Convert database user to UserProfile"""
-        from core.data_models import EducationLevel, CareerStage
-        
         return UserProfile(
             user_id=db_user.user_id,
             name=db_user.name,
             email=db_user.email,
             age=db_user.age,
             location=db_user.location,
-            education_level=EducationLevel(db_user.education_level) if db_user.education_level else None,
-            career_stage=CareerStage(db_user.career_stage) if db_user.career_stage else None,
+            # Plain dict lookups; an unrecognised stored value maps to None
+            education_level=EducationLevel._value2member_map_.get(db_user.education_level),
+            career_stage=CareerStage._value2member_map_.get(db_user.career_stage),
             # Questionnaire fields
             questionnaire_completed=db_user.questionnaire_completed or False,
             questionnaire_responses=db_user.questionnaire_responses,
@@ -596,77 +995,68 @@ class UserRepository:
             updated_at=db_user.updated_at
         )
     
-    def _db_conversation_to_message(self, db_conv: ConversationDB) -> ConversationMessage:
-        """Convert database conversation to ConversationMessage"""
-        return ConversationMessage(
-            message_id=db_conv.message_id,
-            user_id=db_conv.user_id,
-            agent_name=db_conv.agent_name,
-            user_message=db_conv.user_message,
-            agent_response=db_conv.agent_response,
-            context=db_conv.context or {},
-            metadata=db_conv.conversation_metadata or {},
-            confidence=db_conv.confidence,
-            processing_time_ms=db_conv.processing_time_ms,
-            timestamp=db_conv.timestamp
+    def _db_conversation_to_message(self, row: Row) -> ConversationMessage:
+        """Convert a conversation row (with or without the detail columns) to ConversationMessage"""
+        data = row._mapping
+        # Rows were validated when they were written, so skip validation on read
+        return ConversationMessage.model_construct(
+            message_id=data["message_id"],
+            user_id=data["user_id"],
+            agent_name=data["agent_name"],
+            user_message=data["user_message"],
+            agent_response=data["agent_response"],
+            context=data.get("context") or {},
+            metadata=data.get("conversation_metadata") or {},
+            confidence=data["confidence"],
+            processing_time_ms=data["processing_time_ms"],
+            timestamp=data["timestamp"]
         )
     
-    async def save_questionnaire_results(self, user_id: str, results: Dict[str, Any]):
+    async def save_questionnaire_results(
+        self, user_id: str, results: Dict[str, Any], session: Optional[AsyncSession] = None
+    ):
         """Save questionnaire results and mark as completed"""
-        async with self.db_manager.get_session() as session:
+        async with self._write_session(session) as session:
             try:
-                db_user = await session.get(User, user_id)
-                if not db_user:
-                    raise ValueError(f"User {user_id} not found")
-                
-                # Update user with questionnaire results (ensure JSON serializable)
-                db_user.questionnaire_completed = True
-                
                 # Ensure results are JSON serializable
-                import json
-                safe_results = json.loads(json.dumps(results, default=str))
-                db_user.questionnaire_responses = safe_results
+                safe_results = make_json_serializable(results)
                 
-                # Extract and save insights (ensure JSON serializable)
-                analysis = results.get("analysis", {})
+                # Extract and save insights (already JSON-safe as part of the results)
+                analysis = safe_results.get("analysis") or {}
                 
-                # Convert to JSON-safe format
-                import json
-                personality_insights = analysis.get("personality_insights")
-                if personality_insights:
-                    personality_insights = json.loads(json.dumps(personality_insights, default=str))
-                    
-                interest_insights = analysis.get("interest_insights")  
-                if interest_insights:
-                    interest_insights = json.loads(json.dumps(interest_insights, default=str))
-                
-                db_user.personality_insights = personality_insights
-                db_user.interest_insights = interest_insights
-                db_user.updated_at = datetime.utcnow()
+                updated = await self._update_user_columns(
+                    session, user_id,
+                    questionnaire_completed=True,
+                    questionnaire_responses=safe_results,
+                    personality_insights=analysis.get("personality_insights"),
+                    interest_insights=analysis.get("interest_insights")
+                )
+                if not updated:
+                    raise ValueError(f"User {user_id} not found")
                 
-                await session.commit()
+                self._invalidate_on_commit(session, user_id)
                 return True
                 
             except Exception as e:
                 await session.rollback()
                 raise e
     
-    async def reset_questionnaire_data(self, user_id: str) -> bool:
+    async def reset_questionnaire_data(self, user_id: str, session: Optional[AsyncSession] = None) -> bool:
         """Reset all questionnaire data for a user"""
-        async with self.db_manager.get_session() as session:
+        async with self._write_session(session) as session:
             try:
-                db_user = await session.get(User, user_id)
-                if not db_user:
-                    return False
-                
                 # Reset all questionnaire-related fields
-                db_user.questionnaire_completed = False
-                db_user.questionnaire_responses = None
-                db_user.personality_insights = None
-                db_user.interest_insights = None
-                db_user.updated_at = datetime.utcnow()
+                updated = await self._update_user_columns(
+                    session, user_id,
+                    questionnaire_completed=False,
+                    questionnaire_responses=None,
+                    personality_insights=None,
+                    interest_insights=None
+                )
+                if not updated:
+                    return False
                 
-                await session.commit()
+                self._invalidate_on_commit(session, user_id)
                 return True
                 
             except Exception as e:
@@ -677,6 +1067,13 @@ class UserRepository:
 # Global database manager instance
 db_manager = DatabaseManager()
 
+# Global user profile cache shared by all repositories. Each worker process has its own
+# copy, so the TTL bounds how long another worker can serve a profile after an update.
+profile_cache = ProfileCache(ttl_seconds=float(os.getenv("PROFILE_CACHE_TTL_SECONDS", "60")))
+
+# Repositories are stateless wrappers around db_manager, so one instance serves every request
+user_repository = UserRepository(db_manager)
+
 async def get_database() -> DatabaseManager:
     """Dependency to get database manager"""
     if not db_manager.engine:
@@ -685,5 +1082,15 @@ async def get_database() -> DatabaseManager:
 
 async def get_user_repository() -> UserRepository:
     """Dependency to get user repository"""
-    db = await get_database()
-    return UserRepository(db)
\ No newline at end of file
+    await get_database()
+    return user_repository
+
+async def get_db_session():
+    """Dependency yielding one session per request, committed once after the handler returns.
+    
+    Pass it as `session=` to repository writes so a request making several writes uses
+    one connection and one commit. Not for handlers that run queries concurrently.
+    """
+    database = await get_database()
+    async with database.transaction() as session:
+        yield session
\ No newline at end of file
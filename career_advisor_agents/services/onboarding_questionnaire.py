@@ -29,6 +29,92 @@ class QuestionnaireResponse(BaseModel):
     timestamp: datetime = datetime.now()
 
 
+class QuestionnaireSubmission(BaseModel):
+    questions: List[QuestionnaireQuestion] = []
+    responses: List[QuestionnaireResponse] = []
+
+
+# Default questions used whenever AI generation or parsing fails
+_FALLBACK_QUESTIONS_DATA: List[Dict[str, Any]] = [
+    {
+        "id": "q1",
+        "question": "What activities or subjects have you always been naturally drawn to, even outside of work or school?",
+        "question_type": "text",
+        "category": "interests",
+        "importance": 5
+    },
+    {
+        "id": "q2", 
+        "question": "Describe a time when you felt most engaged and energized while working on something. What were you doing?",
+        "question_type": "text",
+        "category": "personality",
+        "importance": 5
+    },
+    {
+        "id": "q3",
+        "question": "What does success look like to you in 5 years? Be as specific as possible.",
+        "question_type": "text",
+        "category": "goals",
+        "importance": 5
+    },
+    {
+        "id": "q4",
+        "question": "When working on a project, do you prefer to: work independently, collaborate closely with others, or lead a team?",
+        "question_type": "multiple_choice",
+        "options": ["Work independently", "Collaborate closely with others", "Lead a team", "It depends on the situation"],
+        "category": "personality",
+        "importance": 4
+    },
+    {
+        "id": "q5",
+        "question": "What kind of impact do you want your career to have on the world or your community?",
+        "question_type": "text",
+        "category": "values",
+        "importance": 4
+    },
+    {
+        "id": "q6",
+        "question": "Which of these work environments appeals to you most?",
+        "question_type": "multiple_choice",
+        "options": ["Fast-paced startup", "Established corporation", "Non-profit organization", "Government agency", "Freelance/consulting", "Academia/research"],
+        "category": "values",
+        "importance": 4
+    },
+    {
+        "id": "q7",
+        "question": "What skills or knowledge areas are you most excited to develop in the next 2 years?",
+        "question_type": "text",
+        "category": "goals",
+        "importance": 4
+    },
+    {
+        "id": "q8",
+        "question": "How important is work-life balance to you on a scale of 1-10?",
+        "question_type": "scale",
+        "scale_min": 1,
+        "scale_max": 10,
+        "category": "values",
+        "importance": 3
+    },
+    {
+        "id": "q9",
+        "question": "Tell me about a challenge or problem you've solved that you're proud of. What was your approach?",
+        "question_type": "text",
+        "category": "background",
+        "importance": 4
+    },
+    {
+        "id": "q10",
+        "question": "Which industries or fields spark your curiosity, even if you don't know much about them yet?",
+        "question_type": "text",
+        "category": "interests",
+        "importance": 4
+    }
+]
+
+_FALLBACK_QUESTIONS = [QuestionnaireQuestion(**q_data) for q_data in _FALLBACK_QUESTIONS_DATA]
+
+
 class OnboardingQuestionnaireService:
     """AI-powered personalized onboarding questionnaire generator"""
     
@@ -162,93 +248,11 @@ Importance: 1-5 (5 = most important)"""
     
     def _get_fallback_questions(self) -> List[QuestionnaireQuestion]:
         """Fallback questions if AI generation fails"""
-        fallback_data = self._get_fallback_questions_data()
-        
-        questions = []
-        for q_data in fallback_data:
-            question = QuestionnaireQuestion(**q_data)
-            questions.append(question)
-        
-        return questions
+        return list(_FALLBACK_QUESTIONS)
     
     def _get_fallback_questions_data(self) -> List[Dict[str, Any]]:
         """Default fallback questions"""
-        return [
-            {
-                "id": "q1",
-                "question": "What activities or subjects have you always been naturally drawn to, even outside of work or school?",
-                "question_type": "text",
-                "category": "interests",
-                "importance": 5
-            },
-            {
-                "id": "q2", 
-                "question": "Describe a time when you felt most engaged and energized while working on something. What were you doing?",
-                "question_type": "text",
-                "category": "personality",
-                "importance": 5
-            },
-            {
-                "id": "q3",
-                "question": "What does success look like to you in 5 years? Be as specific as possible.",
-                "question_type": "text",
-                "category": "goals",
-                "importance": 5
-            },
-            {
-                "id": "q4",
-                "question": "When working on a project, do you prefer to: work independently, collaborate closely with others, or lead a team?",
-                "question_type": "multiple_choice",
-                "options": ["Work independently", "Collaborate closely with others", "Lead a team", "It depends on the situation"],
-                "category": "personality",
-                "importance": 4
-            },
-            {
-                "id": "q5",
-                "question": "What kind of impact do you want your career to have on the world or your community?",
-                "question_type": "text",
-                "category": "values",
-                "importance": 4
-            },
-            {
-                "id": "q6",
-                "question": "Which of these work environments appeals to you most?",
-                "question_type": "multiple_choice",
-                "options": ["Fast-paced startup", "Established corporation", "Non-profit organization", "Government agency", "Freelance/consulting", "Academia/research"],
-                "category": "values",
-                "importance": 4
-            },
-            {
-                "id": "q7",
-                "question": "What skills or knowledge areas are you most excited to develop in the next 2 years?",
-                "question_type": "text",
-                "category": "goals",
-                "importance": 4
-            },
-            {
-                "id": "q8",
-                "question": "How important is work-life balance to you on a scale of 1-10?",
-                "question_type": "scale",
-                "scale_min": 1,
-                "scale_max": 10,
-                "category": "values",
-                "importance": 3
-            },
-            {
-                "id": "q9",
-                "question": "Tell me about a challenge or problem you've solved that you're proud of. What was your approach?",
-                "question_type": "text",
-                "category": "background",
-                "importance": 4
-            },
-            {
-                "id": "q10",
-                "question": "Which industries or fields spark your curiosity, even if you don't know much about them yet?",
-                "question_type": "text",
-                "category": "interests",
-                "importance": 4
-            }
-        ]
+        return list(_FALLBACK_QUESTIONS_DATA)
     
     async def analyze_questionnaire_responses(
         self, 
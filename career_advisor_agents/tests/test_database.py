@@ -0,0 +1,106 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+import services.database
+from core.data_models import ConversationMessage, UserProfile
+from services.database import INITIAL_SKILLS, ConversationArchiveDB, DatabaseManager, Skill, UserRepository
+
+
+def _message(message_id: str, timestamp: datetime) -> ConversationMessage:
+    return ConversationMessage(
+        message_id=message_id,
+        user_id="u1",
+        agent_name="mentor_bot",
+        user_message="hello",
+        agent_response="hi",
+        timestamp=timestamp
+    )
+
+
+async def test_archive_twice_after_hot_ids_are_reused(tmp_path):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    await db.initialize()
+    try:
+        repo = UserRepository(db)
+        await repo.create_user(UserProfile(user_id="u1", name="User", email="u1@example.com"))
+
+        start = datetime(2024, 1, 1)
+        await repo.save_conversations_bulk([_message(f"m{i}", start + timedelta(days=i)) for i in range(3)])
+        assert await repo.archive_conversations(start + timedelta(days=10)) == 3
+
+        # The hot table is empty again, so SQLite hands out the same ids to new rows
+        await repo.save_conversations_bulk([_message(f"n{i}", start + timedelta(days=i)) for i in range(3)])
+        assert await repo.archive_conversations(start + timedelta(days=10)) == 3
+
+        async with db.get_session() as session:
+            archived = await session.scalar(select(func.count()).select_from(ConversationArchiveDB))
+        assert archived == 6
+        assert await repo.get_conversation_history("u1") == []
+    finally:
+        await db.close()
+
+
+@pytest.mark.parametrize("on_conflict", [True, False])
+async def test_initial_skills_seeded_once(tmp_path, monkeypatch, on_conflict):
+    if not on_conflict:
+        # Exercise the count-then-insert path used by dialects without ON CONFLICT
+        monkeypatch.setattr(services.database, "ON_CONFLICT_INSERTS", {})
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    for _ in range(2):
+        db = DatabaseManager(url)
+        await db.initialize()
+        try:
+            async with db.get_session() as session:
+                skills = await session.scalar(select(func.count()).select_from(Skill))
+            assert skills == len(INITIAL_SKILLS)
+        finally:
+            await db.close()
+
+
+async def test_profile_fetch_overlapping_a_write_is_not_cached(tmp_path, monkeypatch):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    await db.initialize()
+    try:
+        repo = UserRepository(db)
+        await repo.create_user(UserProfile(user_id="u1", name="User", email="u1@example.com"))
+        services.database.profile_cache.clear()
+
+        fetch_user = repo._fetch_user
+
+        async def fetch_then_write(user_id):
+            profile = await fetch_user(user_id)
+            # A write commits after the row was read but before the fetch returns
+            await repo.update_user(profile.model_copy(update={"name": "Renamed"}))
+            return profile
+
+        monkeypatch.setattr(repo, "_fetch_user", fetch_then_write)
+        cached = await repo.get_user_cached("u1")
+        assert cached.profile.name == "User"
+        assert services.database.profile_cache.get("u1") is None
+
+        monkeypatch.setattr(repo, "_fetch_user", fetch_user)
+        assert (await repo.get_user("u1")).name == "Renamed"
+    finally:
+        await db.close()
+
+
+async def test_bulk_save_drops_only_the_bad_row(tmp_path):
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    await db.initialize()
+    try:
+        repo = UserRepository(db)
+        await repo.create_user(UserProfile(user_id="u1", name="User", email="u1@example.com"))
+
+        start = datetime(2024, 1, 1)
+        await repo.save_conversations_bulk([_message("dup", start)])
+
+        # The duplicate message_id violates the unique constraint and fails the batch insert
+        batch = [_message("a", start), _message("dup", start), _message("b", start)]
+        assert await repo.save_conversations_bulk(batch) == 2
+
+        history = await repo.get_conversation_history("u1")
+        assert sorted(message.message_id for message in history) == ["a", "b", "dup"]
+    finally:
+        await db.close()